@@ -0,0 +1,122 @@
+"""Memory and time of splitting a large markdown course file into pages.
+
+Run from the repository root::
+
+    python -m benchmarks.bench_markdown_split --size-mb 10
+
+Writes a synthetic course file (prose, shell examples in code fences that
+print ``---`` separators, runs of blank lines) to a temporary directory and
+reports wall time (best of ``--runs``, measured without tracemalloc) and
+tracemalloc peak (a separate run) for:
+
+- ``read_text``: the old approach's first step, reading the whole file;
+- ``read_text + split``: the old approach, splitting the text on every
+  ``---`` line (the reference copy in ``benchmarks.check_equivalence``);
+- ``iter_markdown_pages``: streaming every page without keeping them;
+- ``index_markdown_pages``: the byte span of every page, as counting and the
+  lazy loader do;
+- ``markdown_file``: indexing the file and materializing three pages, as the
+  lazy loader does when the engine opens a module.
+
+The streaming row's peak should stay flat as ``--size-mb`` grows and its time
+close to the ``read_text + split`` row's. The lazy row holds no page text
+beyond the three pages it loads; what it does hold grows with the number of
+pages (one page object and one span each), not their size.
+"""
+
+from __future__ import annotations
+
+import sys
+import tempfile
+import time
+import tracemalloc
+from pathlib import Path
+from typing import Callable, Optional, Sequence
+
+from benchmarks.check_equivalence import reference_split
+from utils.markdown_pages import index_markdown_pages, iter_markdown_pages
+from utils.pages import markdown_file
+
+_PAGE = """
+
+# Lesson {n}
+
+Pipes connect the output of one command to the input of the next: this is
+how small tools compose into larger ones, one line at a time.
+
+```bash
+$ printf 'a\\n---\\nb\\n'
+a
+---
+b
+```
+
+
+
+"""
+
+
+def write_course(path: Path, size_bytes: int) -> int:
+    """Write a synthetic course of about ``size_bytes``; return the page count."""
+    pages = 0
+    written = 0
+    with open(path, "w", encoding="utf-8") as f:
+        while written < size_bytes:
+            chunk = _PAGE.format(n=pages) + "---\n"
+            f.write(chunk)
+            written += len(chunk)
+            pages += 1
+    return pages + 1
+
+
+def _measure(fn: Callable[[], object], runs: int) -> tuple[float, float]:
+    """(best wall time in ms, tracemalloc peak in KiB); tracing would inflate the time."""
+    best = float("inf")
+    for _ in range(max(runs, 1)):
+        t = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - t)
+    tracemalloc.start()
+    fn()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return best * 1000.0, peak / 1024.0
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    import argparse
+
+    parser = argparse.ArgumentParser(prog="python -m benchmarks.bench_markdown_split", description=__doc__.splitlines()[0])
+    parser.add_argument("--size-mb", type=float, default=10.0, help="synthetic file size (default: %(default)s)")
+    parser.add_argument("--runs", type=int, default=3, help="timed runs per step (default: %(default)s)")
+    args = parser.parse_args(argv)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = Path(tmp) / "course.md"
+        pages = write_course(path, int(args.size_mb * 1024 * 1024))
+        print(f"{path.stat().st_size} bytes, {pages} pages")
+
+        def stream() -> None:
+            for _ in iter_markdown_pages(path):
+                pass
+
+        def lazy() -> None:
+            loaded = markdown_file(path)
+            for page in loaded[:3]:
+                page.load()
+
+        print(f"{'ms':>9} {'peak KiB':>10}  step")
+        for name, fn in (
+            ("read_text", lambda: path.read_text(encoding="utf-8")),
+            ("read_text + split", lambda: reference_split(path.read_text(encoding="utf-8"))),
+            ("iter_markdown_pages", stream),
+            ("index_markdown_pages", lambda: index_markdown_pages(path)),
+            ("markdown_file", lazy),
+        ):
+            ms, peak = _measure(fn, args.runs)
+            print(f"{ms:9.1f} {peak:10.1f}  {name}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,63 @@
+"""Micro-benchmark for markdown punctuation normalization.
+
+Run from the repository root::
+
+    python -m benchmarks.bench_normalize
+
+Times a cold (uncached) and a memoized normalization of every ``*.md`` file
+under ``contents/``, then a synthetic colon-dense line of growing length to
+show that the cost scales linearly with the input.
+"""
+
+from __future__ import annotations
+
+import sys
+import time
+from pathlib import Path
+from typing import Callable, Optional, Sequence
+
+from utils.pages import _insert_space_after_punctuation
+
+_REPO_ROOT = Path(__file__).resolve().parent.parent
+
+
+def _best_ms(fn: Callable[[], object], runs: int) -> float:
+    best = float("inf")
+    for _ in range(max(runs, 1)):
+        t = time.perf_counter()
+        fn()
+        best = min(best, (time.perf_counter() - t) * 1000.0)
+    return best
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    import argparse
+
+    parser = argparse.ArgumentParser(prog="python -m benchmarks.bench_normalize", description=__doc__.splitlines()[0])
+    parser.add_argument("--runs", type=int, default=5, help="measurements to take the best of")
+    args = parser.parse_args(argv)
+
+    cold = _insert_space_after_punctuation.__wrapped__
+    files = sorted((_REPO_ROOT / "contents").glob("*/*.md"))
+    print(f"{'cold ms':>9} {'cached ms':>10} {'bytes':>8}  file")
+    total_cold = 0.0
+    for path in files:
+        text = path.read_text(encoding="utf-8")
+        cold_ms = _best_ms(lambda: cold(text), args.runs)
+        _insert_space_after_punctuation(text)
+        cached_ms = _best_ms(lambda: _insert_space_after_punctuation(text), args.runs)
+        total_cold += cold_ms
+        print(f"{cold_ms:9.3f} {cached_ms:10.4f} {len(text.encode('utf-8')):8}  {path.relative_to(_REPO_ROOT)}")
+    print(f"{total_cold:9.3f} {'':10} {'':8}  total ({len(files)} files)")
+    print()
+
+    print(f"{'chars':>8} {'ms':>9} {'ns/char':>8}  synthetic 'a:' line")
+    for n in (1_000, 10_000, 100_000):
+        line = "a:" * (n // 2)
+        ms = _best_ms(lambda: cold(line), args.runs)
+        print(f"{n:8} {ms:9.3f} {ms * 1e6 / n:8.1f}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,77 @@
+"""Steady-state memory of a paging session, per module.
+
+Run from the repository root::
+
+    python -m benchmarks.bench_rss [--dirs pipes.pipes ...] [--json]
+    python -m benchmarks.bench_rss --path /some/module-dir
+
+For every directory under ``contents/`` this runs ``interactive_page_loop``
+in a pseudo-terminal, reads its resident set once the first frame is out,
+pages forward through every page and back again (waiting for each frame),
+and reads it again. ``VmRSS``/``RssAnon``/``VmHWM`` come from
+``/proc/<pid>/status`` (Linux only) and are reported in KiB.
+"""
+
+from __future__ import annotations
+
+import json
+import sys
+import time
+from pathlib import Path
+from typing import Any, Dict, Optional, Sequence
+
+from utils.framestore import parse_sizes
+
+from .pty_session import PtySession
+
+_REPO_ROOT = Path(__file__).resolve().parent.parent
+_CONTENTS = _REPO_ROOT / "contents"
+_FIELDS = ("VmRSS", "RssAnon", "VmHWM")
+
+
+def measure_module(content_dir: Path, size: tuple[int, int], timeout: float = 5.0) -> Dict[str, Any]:
+    from main import load_pages
+
+    pages, _ = load_pages(content_dir)
+    with PtySession(content_dir, size) as session:
+        session.wait_frame(timeout)
+        start = {field: session.status(field) for field in _FIELDS}
+        for key in "R" * (len(pages) - 1) + "L" * (len(pages) - 1):
+            session.press(key)
+            session.wait_frame(timeout)
+        # Let the prefetcher settle before reading the steady state
+        time.sleep(0.3)
+        end = {field: session.status(field) for field in _FIELDS}
+    return {"dir": content_dir.name, "pages": len(pages), "start_kb": start, "end_kb": end}
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    import argparse
+
+    parser = argparse.ArgumentParser(prog="python -m benchmarks.bench_rss", description=__doc__.splitlines()[0])
+    parser.add_argument("--dirs", nargs="*", default=[], help="content directory names (default: all)")
+    parser.add_argument("--path", type=Path, action="append", default=[], help="measure this module directory instead")
+    parser.add_argument("--size", default="100x30", help="WIDTHxHEIGHT of the pseudo-terminal (default: %(default)s)")
+    parser.add_argument("--json", action="store_true", help="print the results as JSON")
+    args = parser.parse_args(argv)
+
+    (size,) = parse_sizes(args.size)
+    dirs = sorted(p for p in _CONTENTS.iterdir() if (p / "export.py").exists())
+    if args.dirs:
+        dirs = [d for d in dirs if d.name in args.dirs]
+    if args.path:
+        dirs = [p.resolve() for p in args.path]
+    results = [measure_module(d, size) for d in dirs]
+
+    if args.json:
+        print(json.dumps(results, indent=2))
+        return 0
+    print(f"{'pages':>5} {'rss start':>10} {'rss end':>10} {'anon end':>10} {'peak':>10}  module (KiB)")
+    for r in results:
+        start, end = r["start_kb"], r["end_kb"]
+        print(f"{r['pages']:5d} {start['VmRSS'] or 0:10d} {end['VmRSS'] or 0:10d} {end['RssAnon'] or 0:10d} {end['VmHWM'] or 0:10d}  {r['dir']}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
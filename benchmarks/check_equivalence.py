@@ -0,0 +1,243 @@
+"""Regression check for the markdown splitter and punctuation normalizer.
+
+Run from the repository root::
+
+    python -m benchmarks.check_equivalence
+
+Both were rewritten for speed: the splitter now streams the file in blocks
+(and, unlike before, does not split on ``---`` inside code fences) and the
+normalizer scans each line with regular expressions. This compares them with
+reference copies of the previous implementations, kept below, on:
+
+- every ``*.md`` file under ``contents/``: the pages, their byte spans read
+  back and the page count, and every page after normalization;
+- seeded random inputs (mixed line endings, Unicode blanks, separators,
+  punctuation, URLs and inline code), the splitter also at tiny block sizes;
+- documents with ``---`` inside code fences, where the new splitter is
+  expected to differ: the fence stays on one page.
+
+The exit code is 1 when anything differs.
+"""
+
+from __future__ import annotations
+
+import random
+import sys
+import tempfile
+from pathlib import Path
+from typing import Callable, List, Optional, Sequence
+
+import utils.markdown_pages as markdown_pages
+from utils.markdown_pages import count_markdown_pages, index_markdown_pages, load_markdown_pages, read_markdown_page
+from utils.pages import _insert_space_after_punctuation
+
+_REPO_ROOT = Path(__file__).resolve().parent.parent
+
+
+# --- Reference implementations (before the rewrite) -------------------------
+
+def reference_split(text: str) -> List[List[str]]:
+    """Pages of ``text``: split on every ``---`` line, blank edges trimmed."""
+    text = text.replace("\r\n", "\n").replace("\r", "\n")
+    raw_pages: List[List[str]] = []
+    current: List[str] = []
+    for raw_line in text.split("\n"):
+        if raw_line.strip() == markdown_pages.SPLIT_TOKEN:
+            raw_pages.append(current)
+            current = []
+            continue
+        current.append(raw_line)
+    raw_pages.append(current)
+    pages: List[List[str]] = []
+    for page in raw_pages:
+        while page and page[0].strip() == "":
+            page.pop(0)
+        while page and page[-1].strip() == "":
+            page.pop()
+        pages.append(page)
+    return pages
+
+
+def reference_normalize(text: str) -> str:
+    """Space after punctuation outside code fences, inline code and URLs (character loop)."""
+
+    def process_segment(seg: str) -> str:
+        out: List[str] = []
+        i = 0
+        n = len(seg)
+        while i < n:
+            ch = seg[i]
+            if ch == "!" and i + 1 < n and seg[i + 1] == "[":
+                out.append(ch)
+                i += 1
+                continue
+            if ch in ",.:;!?)]}\uff0c\u3002":
+                nxt = seg[i + 1] if i + 1 < n else ""
+                if ch == "]" and nxt == "(":
+                    out.append(ch)
+                    i += 1
+                    continue
+                if not nxt or nxt.isspace():
+                    out.append(ch)
+                    i += 1
+                    continue
+                prev = seg[i - 1] if i - 1 >= 0 else ""
+                if ch == "." and prev.isalnum() and nxt.isalnum():
+                    out.append(ch)
+                    i += 1
+                    continue
+                if ch == ":":
+                    j = i - 1
+                    while j >= 0 and (seg[j].isalnum() or seg[j] in "+-."):
+                        j -= 1
+                    if seg[j + 1 : i] in ("http", "https", "ftp") and nxt == "/":
+                        out.append(ch)
+                        i += 1
+                        continue
+                out.append(ch)
+                out.append(" ")
+                i += 1
+                continue
+            out.append(ch)
+            i += 1
+        return "".join(out)
+
+    out_lines: List[str] = []
+    in_fence = False
+    fence_ticks = ""
+    for line in text.replace("\r\n", "\n").replace("\r", "\n").split("\n"):
+        stripped = line.lstrip()
+        if stripped.startswith("```") or stripped.startswith("~~~"):
+            if not in_fence:
+                in_fence = True
+                fence_ticks = stripped[:3]
+            elif stripped.startswith(fence_ticks):
+                in_fence = False
+                fence_ticks = ""
+            out_lines.append(line)
+            continue
+        if in_fence:
+            out_lines.append(line)
+            continue
+        i = 0
+        n = len(line)
+        rebuilt: List[str] = []
+        while i < n:
+            if line[i] == "`":
+                start = i
+                ticks = 1
+                i += 1
+                while i < n and line[i] == "`":
+                    ticks += 1
+                    i += 1
+                close = line.find("`" * ticks, i)
+                if close == -1:
+                    rebuilt.append(process_segment(line[start:]))
+                    break
+                rebuilt.append(line[start : close + ticks])
+                i = close + ticks
+            else:
+                next_bt = line.find("`", i)
+                chunk = line[i:] if next_bt == -1 else line[i:next_bt]
+                rebuilt.append(process_segment(chunk))
+                i = n if next_bt == -1 else next_bt
+        out_lines.append("".join(rebuilt))
+    return "\n".join(out_lines)
+
+
+# --- Checks -------------------------------------------------------------------
+
+_SPLIT_TOKENS = ["---", " --- ", "\t---", "\u3000---", "\x1c---\u205f", "\u2029---\x85", "\xa0", "-- -", "----", "", "  ", "text \xe9", "a: b.c", "\u4e2d\u6587\uff0c\u53e5\u5b50\u3002"]
+_NORMALIZE_TOKENS = list("ab.:,;!?)]}([`/ \n\t1~-\uff0c\u3002") + ["http", "https", "ftp", "```", "![", "](", "://", "\xe9"]
+# A separator inside a fence belongs to the code block; the fence stays on one page.
+# A closing fence needs at least the opening's length; four spaces of indent is not a fence.
+_FENCED = [
+    ("intro\n```bash\necho ---\n---\n```\n---\nnext\n", [["intro", "```bash", "echo ---", "---", "```"], ["next"]]),
+    ("~~~~\n---\n~~~\nstill code\n~~~~\n---\nb", [["~~~~", "---", "~~~", "still code", "~~~~"], ["b"]]),
+    ("   ```\n---\n```\n---\n    ```\n---\n", [["   ```", "---", "```"], ["    ```"], []]),
+]
+
+
+class _Report:
+    def __init__(self) -> None:
+        self.failures = 0
+
+    def check(self, ok: bool, what: str) -> None:
+        if not ok:
+            self.failures += 1
+            if self.failures <= 20:
+                print(f"DIFFERS  {what}")
+
+
+def _split_views(path: Path, report: _Report, what: str) -> List[List[str]]:
+    """The new splitter's pages of ``path``, checked against its span and count views."""
+    pages = load_markdown_pages(path)
+    report.check([read_markdown_page(path, span) for span in index_markdown_pages(path)] == pages, f"{what}: spans")
+    report.check(count_markdown_pages(path) == len(pages), f"{what}: count")
+    return pages
+
+
+def _check_contents(report: _Report, normalize: Callable[[str], str]) -> int:
+    files = sorted((_REPO_ROOT / "contents").glob("*/*.md"))
+    for path in files:
+        what = str(path.relative_to(_REPO_ROOT))
+        expected = reference_split(path.read_text(encoding="utf-8"))
+        report.check(_split_views(path, report, what) == expected, f"{what}: pages")
+        for i, page in enumerate(expected):
+            text = "\n".join(page)
+            report.check(normalize(text) == reference_normalize(text), f"{what}: page {i} normalized")
+    return len(files)
+
+
+def _check_random_splits(report: _Report, rnd: random.Random, cases: int, workdir: Path) -> None:
+    path = workdir / "case.md"
+    chunk_size = markdown_pages._CHUNK_SIZE
+    try:
+        for _ in range(cases):
+            parts = [rnd.choice(_SPLIT_TOKENS) for _ in range(rnd.randint(0, 12))]
+            text = rnd.choice(["\n", "\r\n", "\r"]).join(parts) + rnd.choice(["", "\n"])
+            path.write_bytes(text.encode("utf-8"))
+            expected = reference_split(text)
+            for size in (chunk_size, 1, 2, 7):
+                markdown_pages._CHUNK_SIZE = size
+                report.check(_split_views(path, report, f"split {text!r}") == expected, f"split {text!r} (block {size})")
+    finally:
+        markdown_pages._CHUNK_SIZE = chunk_size
+
+
+def _check_random_normalize(report: _Report, rnd: random.Random, cases: int, normalize: Callable[[str], str]) -> None:
+    for _ in range(cases):
+        text = "".join(rnd.choice(_NORMALIZE_TOKENS) for _ in range(rnd.randint(0, 40)))
+        report.check(normalize(text) == reference_normalize(text), f"normalize {text!r}")
+
+
+def _check_fenced(report: _Report, workdir: Path) -> None:
+    path = workdir / "fenced.md"
+    for text, expected in _FENCED:
+        path.write_text(text, encoding="utf-8")
+        report.check(_split_views(path, report, f"fenced {text!r}") == expected, f"fenced {text!r}")
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    import argparse
+
+    parser = argparse.ArgumentParser(prog="python -m benchmarks.check_equivalence", description=__doc__.splitlines()[0])
+    parser.add_argument("--cases", type=int, default=2000, help="random inputs per check (default: %(default)s)")
+    parser.add_argument("--seed", type=int, default=1, help="random seed (default: %(default)s)")
+    args = parser.parse_args(argv)
+
+    normalize = _insert_space_after_punctuation.__wrapped__  # uncached
+    report = _Report()
+    rnd = random.Random(args.seed)
+    files = _check_contents(report, normalize)
+    with tempfile.TemporaryDirectory(prefix="shell-dojo-eq-") as tmp:
+        _check_random_splits(report, rnd, args.cases, Path(tmp))
+        _check_fenced(report, Path(tmp))
+    _check_random_normalize(report, rnd, args.cases * 10, normalize)
+    print(f"{files} content files, {args.cases} random splits, {args.cases * 10} random lines, {len(_FENCED)} fenced cases: "
+          f"{report.failures} differences")
+    return 1 if report.failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,94 @@
+"""Run ``interactive_page_loop`` in a pseudo-terminal for benchmarks."""
+
+from __future__ import annotations
+
+import os
+import sys
+import time
+from pathlib import Path
+from typing import Optional
+
+from utils.screen import SYNC_END
+
+_REPO_ROOT = Path(__file__).resolve().parent.parent
+
+KEYS = {"R": b"\x1b[C", "L": b"\x1b[D"}
+_LOOP_CHILD = """
+from pathlib import Path
+from rich.console import Console
+import main
+pages, _ = main.load_pages(Path({content_dir!r}))
+main.interactive_page_loop(Console(), pages)
+"""
+
+
+class PtySession:
+    """One engine session on a pty of ``size``; frames end at the sync-update marker."""
+
+    def __init__(self, content_dir: Path, size: tuple[int, int]):
+        import fcntl
+        import pty
+        import struct
+        import termios
+
+        width, height = size
+        self.pid, self.fd = pty.fork()
+        if self.pid == 0:  # pragma: no cover - child
+            os.chdir(_REPO_ROOT)
+            code = _LOOP_CHILD.format(content_dir=str(content_dir))
+            os.execv(sys.executable, [sys.executable, "-c", code])
+        fcntl.ioctl(self.fd, termios.TIOCSWINSZ, struct.pack("HHHH", height, width, 0, 0))
+
+    def wait_frame(self, timeout: float = 5.0) -> bool:
+        """Read output until a frame completes; False on timeout or exit."""
+        import select
+
+        deadline = time.perf_counter() + timeout
+        seen = b""
+        while time.perf_counter() < deadline:
+            ready, _, _ = select.select([self.fd], [], [], max(deadline - time.perf_counter(), 0))
+            if not ready:
+                break
+            try:
+                chunk = os.read(self.fd, 65536)
+            except OSError:
+                return False
+            if not chunk:
+                return False
+            seen = seen[-len(SYNC_END):] + chunk
+            if SYNC_END in seen:
+                return True
+        return False
+
+    def press(self, key: str) -> None:
+        os.write(self.fd, KEYS.get(key, key.encode()))
+
+    def status(self, field: str) -> Optional[int]:
+        """A ``kB`` field (e.g. ``VmRSS``) of the session's /proc status."""
+        try:
+            with open(f"/proc/{self.pid}/status", encoding="ascii") as f:
+                for line in f:
+                    if line.startswith(field + ":"):
+                        return int(line.split()[1])
+        except OSError:
+            pass
+        return None
+
+    def close(self) -> None:
+        try:
+            os.write(self.fd, b"q")
+        except OSError:
+            pass
+        try:
+            os.waitpid(self.pid, 0)
+        finally:
+            os.close(self.fd)
+
+    def __enter__(self) -> "PtySession":
+        return self
+
+    def __exit__(self, *exc: object) -> None:
+        self.close()
+
+
+__all__ = ["KEYS", "PtySession"]
@@ -0,0 +1,185 @@
+"""Headless benchmark suite for the page engine.
+
+Run from the repository root::
+
+    python -m benchmarks.suite --out bench.json
+    python -m benchmarks.suite --out new.json --compare bench.json
+
+Measures, and stores as JSON for comparing runs between commits:
+
+- ``import_ms``: cold ``import main`` in a fresh interpreter (best of N);
+- ``load_pages_ms``: ``load_pages`` for every directory under ``contents/``;
+- ``render``: per-page render time (first render of a fresh page, and a
+  repeat render) at several terminal sizes;
+- ``keypress``: keypress-to-frame latency of ``interactive_page_loop``
+  running in a pseudo-terminal, driven by scripted arrow keys. A frame is
+  complete when its synchronized-update end marker has been written.
+"""
+
+from __future__ import annotations
+
+import json
+import platform
+import subprocess
+import sys
+import time
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Sequence
+
+from utils.framestore import DEFAULT_SIZES, parse_sizes
+from utils.import_budget import measure_import_ms
+
+from .pty_session import PtySession
+
+_REPO_ROOT = Path(__file__).resolve().parent.parent
+_CONTENTS = _REPO_ROOT / "contents"
+
+def _best_ms(fn, runs: int) -> float:
+    best = float("inf")
+    for _ in range(max(runs, 1)):
+        t = time.perf_counter()
+        fn()
+        best = min(best, (time.perf_counter() - t) * 1000.0)
+    return best
+
+
+def _content_dirs(names: Sequence[str]) -> List[Path]:
+    dirs = sorted(p for p in _CONTENTS.iterdir() if (p / "export.py").exists())
+    if names:
+        dirs = [d for d in dirs if d.name in names]
+    return dirs
+
+
+def bench_load_pages(dirs: Sequence[Path], runs: int) -> Dict[str, float]:
+    from main import load_pages
+
+    return {d.name: round(_best_ms(lambda: load_pages(d), runs), 3) for d in dirs}
+
+
+def bench_render(dirs: Sequence[Path], sizes: Sequence[tuple[int, int]]) -> Dict[str, Any]:
+    """First and repeat render time (ms) of every page at every size."""
+    from main import load_pages
+    from utils.frames import render_frame
+
+    out: Dict[str, Any] = {}
+    for d in dirs:
+        per_size: Dict[str, Any] = {}
+        for width, height in sizes:
+            # Fresh page objects, so the first render pays for parsing and layout
+            pages, _ = load_pages(d)
+            first: List[float] = []
+            repeat: List[float] = []
+            for page in pages:
+                for timings in (first, repeat):
+                    t = time.perf_counter()
+                    render_frame(page, width, height, color_system="truecolor")
+                    timings.append(round((time.perf_counter() - t) * 1000.0, 3))
+            per_size[f"{width}x{height}"] = {"first_ms": first, "repeat_ms": repeat}
+        out[d.name] = per_size
+    return out
+
+
+def bench_keypress(content_dir: Path, keys: str, size: tuple[int, int], timeout: float = 5.0) -> Dict[str, Any]:
+    """Drive ``interactive_page_loop`` in a pty and time each key until its frame is out."""
+    latencies: List[Optional[float]] = []
+    with PtySession(content_dir, size) as session:
+        t = time.perf_counter()
+        startup = session.wait_frame(timeout)
+        first_frame_ms = round((time.perf_counter() - t) * 1000.0, 3) if startup else None
+        # Give the prefetcher the same idle time a reader would
+        time.sleep(0.2)
+        for key in keys:
+            t = time.perf_counter()
+            session.press(key)
+            ok = session.wait_frame(timeout)
+            latencies.append(round((time.perf_counter() - t) * 1000.0, 3) if ok else None)
+            time.sleep(0.05)
+    done = sorted(v for v in latencies if v is not None)
+    width, height = size
+    return {
+        "dir": content_dir.name,
+        "size": f"{width}x{height}",
+        "keys": keys,
+        "first_frame_ms": first_frame_ms,
+        "latency_ms": latencies,
+        "p50_ms": done[len(done) // 2] if done else None,
+        "max_ms": done[-1] if done else None,
+    }
+
+
+def _git_commit() -> Optional[str]:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], cwd=_REPO_ROOT, capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def summarize(results: Dict[str, Any]) -> Dict[str, float]:
+    """Flatten ``results`` into a few headline numbers (ms)."""
+    summary: Dict[str, float] = {"import_ms": results["import_ms"]}
+    summary["load_pages_total_ms"] = round(sum(results["load_pages_ms"].values()), 3)
+    for size in results["sizes"]:
+        first = [v for d in results["render"].values() for v in d[size]["first_ms"]]
+        repeat = [v for d in results["render"].values() for v in d[size]["repeat_ms"]]
+        summary[f"render_first_total_ms@{size}"] = round(sum(first), 3)
+        summary[f"render_repeat_total_ms@{size}"] = round(sum(repeat), 3)
+    keypress = results.get("keypress")
+    if keypress and keypress["p50_ms"] is not None:
+        summary["keypress_p50_ms"] = keypress["p50_ms"]
+        summary["keypress_max_ms"] = keypress["max_ms"]
+    return summary
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    import argparse
+
+    parser = argparse.ArgumentParser(prog="python -m benchmarks.suite", description=__doc__.splitlines()[0])
+    parser.add_argument("--out", type=Path, help="write results as JSON to this file")
+    parser.add_argument("--compare", type=Path, help="print the change against an earlier results file")
+    parser.add_argument("--dirs", nargs="*", default=[], help="content directory names (default: all)")
+    parser.add_argument(
+        "--sizes",
+        default=",".join(f"{w}x{h}" for w, h in DEFAULT_SIZES),
+        help="comma separated WIDTHxHEIGHT terminal sizes (default: %(default)s)",
+    )
+    parser.add_argument("--runs", type=int, default=5, help="measurements to take the best of")
+    parser.add_argument("--keys", default="RRRRRLLLLL", help="scripted keys, R(ight)/L(eft) (default: %(default)s)")
+    parser.add_argument("--keypress-dir", default="pipes.pipes", help="content directory for the keypress run")
+    args = parser.parse_args(argv)
+
+    sizes = parse_sizes(args.sizes)
+    dirs = _content_dirs(args.dirs)
+    results: Dict[str, Any] = {
+        "meta": {
+            "commit": _git_commit(),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "time": time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+        },
+        "sizes": [f"{w}x{h}" for w, h in sizes],
+        "import_ms": round(measure_import_ms("main", runs=args.runs), 3),
+        "load_pages_ms": bench_load_pages(dirs, args.runs),
+        "render": bench_render(dirs, sizes),
+    }
+    keypress_dir = _CONTENTS / args.keypress_dir
+    if args.keys and (keypress_dir / "export.py").exists():
+        results["keypress"] = bench_keypress(keypress_dir, args.keys, sizes[0])
+    results["summary"] = summarize(results)
+
+    baseline = json.loads(args.compare.read_text()) if args.compare else {}
+    base_summary = baseline.get("summary", {})
+    print(f"{'ms':>10} {'change':>8}  metric")
+    for name, value in results["summary"].items():
+        base = base_summary.get(name)
+        change = f"{(value - base) / base * 100.0:+7.1f}%" if base else ""
+        print(f"{value:10.2f} {change:>8}  {name}")
+
+    if args.out:
+        args.out.write_text(json.dumps(results, indent=2) + "\n", encoding="utf-8")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,3 +1,5 @@
+from __future__ import annotations
+
 import os
 from pathlib import Path
 import sys
@@ -8,13 +10,81 @@ from rich.text import Text
 import termios
 import tty
 import select
-import importlib.util
-from typing import cast, Callable, Optional, Dict, Any
+import selectors
+import threading
+import json
+from typing import Callable, Optional, Dict, Any, Sequence, TYPE_CHECKING
 from utils.pages import Page
-import utils.pages as pages_mod
+from utils.frames import EncodedFrame, FrameCache, inner_size, render_frame, render_renderable_frame
+from utils.prefetch import Prefetcher
+from utils.checkpoint import Checkpoint
+from utils.course import COURSE_MANIFEST, CourseCheckpoint, CourseSource, load_course
+from utils.framestore import FrameStore, open_framestore
+from utils.loader import iter_module_pages, load_module_page, load_module_pages, load_pages
+from utils.page_source import PageSource
+from utils.screen import Screen
+from utils.template import CHALLENGE_CONFIG, read_challenge_id, set_session_value
+from utils import trace
+
+if TYPE_CHECKING:  # imported when the page loop starts (see utils.import_budget)
+    import asyncio
+
+    from utils.page_index import PageIndex
 
 ANSI_HIDE_CURSOR = "\033[?25l"
 ANSI_SHOW_CURSOR = "\033[?25h"
+# Seconds the terminal size must stay unchanged before a resized page is re-rendered
+DEFAULT_RESIZE_QUIET = 0.15
+BACKSPACE_KEYS = ("\x7f", "\b")
+
+
+def _read_key(fd: int) -> Optional[str]:
+    """Read one key (or a whole escape sequence) from ``fd``; None if nothing decodable arrived."""
+    raw = os.read(fd, 1)
+    if not raw:
+        raise EOFError
+    if raw[0] >= 0xC0:  # UTF-8 lead byte (e.g. CJK typed into a search): read the whole character
+        size = 2 if raw[0] < 0xE0 else 3 if raw[0] < 0xF0 else 4
+        while len(raw) < size:
+            more = os.read(fd, size - len(raw))
+            if not more:
+                break
+            raw += more
+    ch = raw.decode(errors="ignore")
+    if not ch:
+        return None
+    if ch == "\x03":  # Ctrl-C
+        raise KeyboardInterrupt
+    if ch in ("\r", "\n"):
+        return "\n"
+    if ch == "\x1b":  # start of escape sequence
+        seq = ch
+        # Collect remainder with tiny timeout windows
+        while True:
+            r, _, _ = select.select([fd], [], [], 0.001)
+            if not r:
+                break
+            nxt = os.read(fd, 1).decode(errors="ignore")
+            if not nxt:
+                break
+            seq += nxt
+            # Heuristic: end when final char is alphabetic or tilde (typical CSI terminators)
+            if nxt.isalpha() or nxt == "~":
+                break
+        return seq
+    return ch
+
+
+@trace.traced("keys.read")
+def _read_available_keys(fd: int) -> list[str]:
+    """Read the next key plus every key already waiting in the input buffer."""
+    keys: list[str] = []
+    while True:
+        key = _read_key(fd)
+        if key is not None:
+            keys.append(key)
+        if not select.select([fd], [], [], 0)[0]:
+            return keys
 
 
 def _read_keys_no_echo(
@@ -29,28 +99,46 @@ def _read_keys_no_echo(
     Enhancements:
       * Robust escape sequence parsing with short timeout to capture variable-length CSI sequences
       * Does not block indefinitely if user presses bare ESC
-      * Periodically polls (``poll_interval``) so that external events (e.g., terminal resize)
-        can trigger a re-render via a shared ``resize_flag`` dict and ``on_resize`` callback.
+      * Event driven: blocks until a key arrives or a signal (e.g. SIGWINCH) is
+        delivered, via ``signal.set_wakeup_fd`` on a self-pipe, so an idle
+        session makes no wakeups. A pending ``resize_flag`` then triggers the
+        ``on_resize`` callback. Where the wakeup fd cannot be installed (not on
+        the main thread) it falls back to polling every ``poll_interval``.
 
     Parameters:
         stop_on_enter: If True, stop iteration upon Enter (used for paused screens)
         resize_flag: Mutable dict containing a boolean-like ``pending`` key when a resize occurred
         on_resize: Callback invoked (coalesced) when resize_flag["pending"] is truthy
-        poll_interval: Seconds for select() timeout enabling responsive resize redraws
+        poll_interval: Fallback select() timeout when signal wakeups are unavailable
     """
     if not sys.stdin.isatty():
         return
     fd = sys.stdin.fileno()
     old_settings = termios.tcgetattr(fd)
+    wakeup_r, wakeup_w = os.pipe()
+    os.set_blocking(wakeup_r, False)
+    os.set_blocking(wakeup_w, False)
+    timeout: Optional[float] = None
+    previous_wakeup_fd: Optional[int] = None
+    try:
+        previous_wakeup_fd = signal.set_wakeup_fd(wakeup_w, warn_on_full_buffer=False)
+    except ValueError:  # pragma: no cover - not on the main thread
+        timeout = poll_interval
+    sel = selectors.DefaultSelector()
+    sel.register(fd, selectors.EVENT_READ)
+    sel.register(wakeup_r, selectors.EVENT_READ)
     try:
         # cbreak gives immediate char delivery but retains ISIG so Ctrl-C still works
         tty.setcbreak(fd)
         while True:
-            # Wait for input or timeout to check resize flag
-            try:
-                rlist, _, _ = select.select([fd], [], [], poll_interval)
-            except InterruptedError:  # pragma: no cover - interrupted by signal
-                rlist = []
+            # Sleep until input arrives or a signal handler has run
+            ready = {key.fd for key, _ in sel.select(timeout)}
+            if wakeup_r in ready:
+                try:
+                    while os.read(wakeup_r, 512):
+                        pass
+                except BlockingIOError:
+                    pass
             if resize_flag and resize_flag.get("pending"):
                 resize_flag["pending"] = False
                 if on_resize:
@@ -58,37 +146,21 @@ def _read_keys_no_echo(
                         on_resize()
                     except Exception:  # pragma: no cover - defensive
                         pass
-            if not rlist:
-                continue
-            ch = os.read(fd, 1).decode(errors="ignore")
-            if not ch:
-                continue
-            if ch == "\x03":  # Ctrl-C
-                raise KeyboardInterrupt
-            if ch in ("\r", "\n"):
-                if stop_on_enter:
-                    break
-                yield "\n"
+            if fd not in ready:
                 continue
-            if ch == "\x1b":  # start of escape sequence
-                seq = ch
-                # Collect remainder with tiny timeout windows
-                while True:
-                    r, _, _ = select.select([fd], [], [], 0.001)
-                    if not r:
-                        break
-                    nxt = os.read(fd, 1).decode(errors="ignore")
-                    if not nxt:
-                        break
-                    seq += nxt
-                    # Heuristic: end when final char is alphabetic or tilde (typical CSI terminators)
-                    if nxt.isalpha() or nxt == "~":
-                        break
-                yield seq
+            key = _read_key(fd)
+            if key is None:
                 continue
-            yield ch
+            if key == "\n" and stop_on_enter:
+                break
+            yield key
     finally:
         termios.tcsetattr(fd, termios.TCSADRAIN, old_settings)
+        if previous_wakeup_fd is not None:
+            signal.set_wakeup_fd(previous_wakeup_fd)
+        sel.close()
+        os.close(wakeup_r)
+        os.close(wakeup_w)
 
 
 def render_page(
@@ -177,147 +249,559 @@ def show_splash(console: Console, *, pause: bool = True) -> None:
     render_page(console, art_lines, pause=pause, clear=True)
 
 
-def _import_module_from_path(path: Path):
-    spec = importlib.util.spec_from_file_location(path.stem, path)
-    if spec and spec.loader:
-        module = importlib.util.module_from_spec(spec)
-        spec.loader.exec_module(module)  # type: ignore[attr-defined]
-        return module
-    raise ImportError(f"Cannot import module from {path}")
-
-
-def load_pages(contents_root: Path) -> tuple[list[Page], bool]:
-    """Discover export.py modules under contents and collect their pages.
-
-    Returns (pages, any_show_splash_flag)
-    """
-    pages: list[Page] = []
-    show_splash_any = False
-    global_index = 0
-    if not contents_root.exists():
-        return pages, show_splash_any
-    export_files = set()
-    export_files.update(contents_root.glob("export.py"))
-    export_files.update(contents_root.glob("*/export.py"))  # nested version
-    for export_file in sorted(export_files):
-        try:
-            mod = _import_module_from_path(export_file)
-        except Exception as e:  # pragma: no cover - best effort
-            print(f"Failed to import {export_file}: {e}", file=sys.stderr)
-            continue
-        _module_name = getattr(mod, "__module_name__", export_file.parent.name)
-        show_splash_any = show_splash_any or bool(getattr(mod, "__show_splash__", False))
-        raw_pages = getattr(mod, "__pages__", [])
-        if not isinstance(raw_pages, list):
-            continue
-        for idx, p in enumerate(raw_pages):
-            if not p:
-                continue
-            # New protocol: object with a callable .render(width,height)
-            if hasattr(p, "render") and callable(getattr(p, "render")):
-                pages.append(cast(Page, p))
-                global_index += 1
-                continue
-            if isinstance(p, dict) and "__markdown__" in p:  # legacy dict form
-                md_src = str(p["__markdown__"]).rstrip("\n")
-                pages.append(pages_mod.markdown_page(md_src))
-                global_index += 1
-                continue
-            if isinstance(p, list):  # legacy list-of-lines
-                safe_lines = [str(line) for line in p]
-                pages.append(pages_mod.lines_page(safe_lines))
-                global_index += 1
-    return pages, show_splash_any
-
-
+@trace.traced()
 def _wrap_and_print(console: Console, renderable, *, border_style: str = "yellow") -> None:
     console.clear()
     panel = Panel(renderable, border_style=border_style, expand=True, padding=(0, 2))
     console.print(panel)
 
 
-def interactive_page_loop(console: Console, pages: list[Page]) -> None:
-    if not pages:
-        console.print("[red]No content pages found.[/red]")
-        return
+def _has_page(pages: Sequence[Page], index: int) -> bool:
+    """True when ``index`` exists; waits for a loading ``PageSource`` if needed."""
+    if index < 0:
+        return False
+    try:
+        pages[index]
+    except IndexError:
+        return False
+    return True
+
 
-    current = 0
-    total = len(pages)
+def _run_in_thread(loop: asyncio.AbstractEventLoop, fn: Callable[..., Any], *args: Any) -> asyncio.Future:
+    """Run ``fn`` on a daemon thread and return a future for its result.
+
+    Cancelling the future discards the result; unlike an executor, abandoned
+    work never delays interpreter exit.
+    """
+    fut = loop.create_future()
 
-    def render_current():
-        os.system('cls' if os.name == 'nt' else 'clear')
-        size = console.size
-        # Leave last row for raw-key input, subtract panel borders (2) and padding (0 vertically)
-        inner_height = max(size.height - 1 - 2, 0)
-        inner_width = max(size.width - 6, 10)  # borders (2) + padding (4)
-        page = pages[current]
+    def deliver(setter: Callable[[Any], None], value: Any) -> None:
+        if not fut.done():
+            setter(value)
+
+    def worker() -> None:
+        try:
+            result = fn(*args)
+        except BaseException as e:  # pragma: no cover - surfaced through the future
+            callback: tuple[Any, ...] = (deliver, fut.set_exception, e)
+        else:
+            callback = (deliver, fut.set_result, result)
         try:
-            renderable = page.render(inner_width, inner_height)
-        except Exception as e:  # pragma: no cover - prevent crash on faulty page
-            renderable = Text(f"[red]Error rendering page: {e}[/red]")
-        _wrap_and_print(console, renderable)
+            loop.call_soon_threadsafe(*callback)
+        except RuntimeError:  # loop already closed; nobody is waiting
+            pass
 
-    # --- Resize handling (SIGWINCH) ---
-    resize_state: Dict[str, Any] = {"pending": False}
+    threading.Thread(target=worker, name="page-render", daemon=True).start()
+    return fut
 
-    def _sigwinch_handler(signum, frame):  # pragma: no cover - signal-driven
-        resize_state["pending"] = True
 
-    previous_handler = None
-    try:
-        previous_handler = signal.getsignal(signal.SIGWINCH)
-        signal.signal(signal.SIGWINCH, _sigwinch_handler)
-    except Exception:  # pragma: no cover - platform without SIGWINCH
-        resize_state = {}
+class _PageEngine:
+    """asyncio page engine: keyboard input, resize events and rendering are separate.
 
-    render_current()
+    Input is read by an event-loop reader callback and resizes arrive through
+    the loop's signal handling, so both stay responsive while a page renders
+    on a worker thread. Starting a new render cancels the previous one; a
+    cancelled render's result is dropped and never reaches the screen.
 
-    try:
-        for key in _read_keys_no_echo(
-            stop_on_enter=False,
-            resize_flag=resize_state,
-            on_resize=render_current,
-            poll_interval=0.12,
-        ):
+    Resizes are debounced: each SIGWINCH repaints the last frame clipped to
+    the new size and restarts a ``resize_quiet`` second timer; the page is
+    only re-rendered once the size has stopped changing for that long.
+
+    Besides Left/Right, ``g``/``G`` jump to the first/last page, a page number
+    followed by Enter jumps to that page and ``/`` searches the page text
+    (``n``/``N`` repeat the search forwards/backwards). Searches use a
+    ``PageIndex`` built on a worker thread when the session starts. Jumps
+    render only the destination page; prompts and messages appear on the
+    input row below the frame. Every navigation is recorded in ``checkpoint``
+    when one is given.
+    """
+
+    def __init__(
+        self,
+        console: Console,
+        pages: Sequence[Page],
+        *,
+        frame_cache: Optional[FrameCache] = None,
+        frame_store: Optional[FrameStore] = None,
+        resize_quiet: float = DEFAULT_RESIZE_QUIET,
+        page_index: Optional[PageIndex] = None,
+        start: int = 0,
+        checkpoint: Optional[Checkpoint] = None,
+    ):
+        self.console = console
+        self.pages = pages
+        self.current = start if _has_page(pages, start) else 0
+        self.page_index = page_index
+        self.checkpoint = checkpoint
+        # Building or extending the index (on a worker thread) and a jump waiting for it or for the page count
+        self._index_future: Optional[asyncio.Future] = None
+        self._jump_task: Optional[asyncio.Task] = None
+        # Typed page number, search prompt text (None when not searching) and last search
+        self._digits = ""
+        self._query: Optional[str] = None
+        self._last_query = ""
+        # Message to show on the input row once the next frame is out
+        self._pending_status: Optional[str] = None
+        self.cache = frame_cache if frame_cache is not None else FrameCache()
+        self.frame_store = frame_store
+        self.color_system = console.color_system
+        self.prefetcher = Prefetcher(self.cache, self.render_page_frame)
+        self.screen = Screen(console.file)
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._done: Optional[asyncio.Event] = None
+        self._render_task: Optional[asyncio.Task] = None
+        self.resize_quiet = max(resize_quiet, 0.0)
+        self._resize_timer: Optional[asyncio.TimerHandle] = None
+
+    def render_page_frame(self, page: Page, width: int, height: int) -> EncodedFrame:
+        return EncodedFrame(render_frame(page, width, height, color_system=self.color_system))
+
+    def page_frame(self, index: int, width: int, height: int) -> EncodedFrame:
+        """Cached or freshly rendered frame for page ``index`` (blocking; runs off-loop)."""
+        page = self.pages[index]
+        key = (page, width, height)
+        frame = self.prefetcher.wait_for(key)
+        if frame is None:
+            try:
+                frame = self.render_page_frame(page, width, height)
+            except Exception as e:  # pragma: no cover - prevent crash on faulty page
+                frame = EncodedFrame(render_renderable_frame(
+                    Text(f"[red]Error rendering page: {e}[/red]"),
+                    width,
+                    height,
+                    color_system=self.color_system,
+                ))
+            else:
+                self.cache.put(key, frame)
+        return frame
+
+    # --- Rendering ---
+
+    def request_render(self) -> None:
+        """Show the current page, rendering it on a worker thread if needed."""
+        assert self._loop is not None
+        if self._render_task is not None and not self._render_task.done():
+            self._render_task.cancel()
+        size = self.console.size
+        width, height = size.width, size.height
+        if self.cache.resize(width, height):
+            self.prefetcher.invalidate()
+            self.screen.invalidate()  # the terminal reflowed whatever was on screen
+        index = self.current
+        frame: Any = self.frame_store.lookup(index, width, height) if self.frame_store else None
+        if frame is None:
+            frame = self.cache.get((self.pages[index], width, height))
+        if frame is not None:
+            self._present(frame, index, width, height)
+            return
+        self._render_task = self._loop.create_task(self._render(index, width, height))
+
+    async def _render(self, index: int, width: int, height: int) -> None:
+        assert self._loop is not None
+        frame = await _run_in_thread(self._loop, self.page_frame, index, width, height)
+        self._present(frame, index, width, height)
+
+    def _present(self, frame: Any, index: int, width: int, height: int) -> None:
+        self.screen.present(frame, height)
+        if self._pending_status is not None:
+            self._show_status(self._pending_status)
+            self._pending_status = None
+        # Warm the neighbours while the user reads this page
+        neighbours = [
+            self.pages[i]
+            for i in (index + 1, index - 1)
+            if self._is_loaded(i)
+            and (self.frame_store is None or self.frame_store.lookup(i, width, height) is None)
+        ]
+        self.prefetcher.schedule(neighbours, width, height)
+
+    # --- Events ---
+
+    def _finish(self) -> None:
+        assert self._done is not None
+        self._done.set()
+
+    @trace.traced("engine.on_input")
+    def _on_input(self, fd: int) -> None:
+        try:
+            keys = _read_available_keys(fd)
+        except (EOFError, KeyboardInterrupt):
+            self._finish()
+            return
+        # Work out the net navigation of everything typed (e.g. a held arrow
+        # key) and render only the page we end up on
+        target = self.current
+        for key in keys:
+            if self._query is not None:
+                target = self._edit_query(key, target)
+                continue
             if key in ("q", "Q"):
-                break
+                self._finish()
+                return
+            if len(key) == 1 and key.isdigit():
+                self._digits += key
+                self._show_status(f"Go to page: {self._digits}")
+                continue
+            if key in BACKSPACE_KEYS and self._digits:
+                self._digits = self._digits[:-1]
+                self._show_status(f"Go to page: {self._digits}" if self._digits else "")
+                continue
+            if key in ("\n", "\r") and self._digits:
+                target = self._counted_target(target, int(self._digits))
+                self._digits = ""
+                self._show_status("")
+                continue
+            if self._digits:
+                self._digits = ""
+                self._show_status("")
+            if key == "g":
+                target = 0
+                continue
+            if key == "G":
+                target = self._counted_target(target, None)
+                continue
+            if key == "/":
+                self._query = ""
+                self._show_status("/")
+                continue
+            if key in ("n", "N"):
+                if self._last_query:
+                    target = self._search(self._last_query, target, 1 if key == "n" else -1)
+                continue
             if key in ("\x1b[D",):  # Left arrow
-                if current > 0:
-                    current -= 1
-                    render_current()
+                target = max(target - 1, 0)
                 continue
             if key in ("\x1b[C", "\n", "\r"):  # Right arrow or Enter
-                if current < total - 1:
-                    current += 1
-                    render_current()
-                else:
-                    break
+                if not _has_page(self.pages, target + 1):
+                    # Read to the end: a relaunch starts from the beginning again
+                    if self.checkpoint is not None:
+                        self.checkpoint.clear()
+                    self._finish()
+                    return
+                target += 1
                 continue
             # Ignore all other input silently
+        if target != self.current:
+            self._go(target)
+        elif self._pending_status is not None:
+            self._show_status(self._pending_status)
+            self._pending_status = None
+
+    def _go(self, index: int) -> None:
+        if self._jump_task is not None:
+            # The reader moved on; a jump still waiting would pull them back
+            self._jump_task.cancel()
+            self._jump_task = None
+        section = self._section(index)
+        if section is not None and section != self._section(self.current) and self._pending_status is None:
+            self._pending_status = section
+        self.current = index
+        if self.checkpoint is not None:
+            size = self.console.size
+            self.checkpoint.save(index, size.width, size.height)
+        self.request_render()
+
+    def _section(self, index: int) -> Optional[str]:
+        """Title of the part of ``pages`` page ``index`` is in (course modules; see ``CourseSource``)."""
+        section_title = getattr(self.pages, "section_title", None)
+        return section_title(index) if section_title is not None else None
+
+    # --- Jumps and search ---
+
+    def _is_loaded(self, index: int) -> bool:
+        """True when page ``index`` exists and is loaded (never waits for a course module)."""
+        loaded = getattr(self.pages, "loaded", None)
+        if loaded is not None:
+            return 0 <= index < len(loaded)
+        return _has_page(self.pages, index)
+
+    @staticmethod
+    def _page_number_target(number: Optional[int], count: int) -> int:
+        """Index of 1-based page ``number`` (None: the last page), clamped to ``count`` pages."""
+        return count - 1 if number is None else min(max(number, 1), count) - 1
+
+    def _counted_target(self, target: int, number: Optional[int]) -> int:
+        """Target of a jump to page ``number`` (None: the last page).
+
+        Counting pages that are still loading waits for all of them, so the
+        count is taken on a worker thread and the jump happens once it is known.
+        """
+        if getattr(self.pages, "done", True):
+            return self._page_number_target(number, len(self.pages))
+        assert self._loop is not None
+        self._show_status("Loading...")
+        self._start_jump(self._jump_when_counted(number))
+        return target
+
+    def _start_jump(self, jump: Any) -> None:
+        assert self._loop is not None
+        if self._jump_task is not None:
+            self._jump_task.cancel()
+        self._jump_task = self._loop.create_task(jump)
+
+    async def _jump_when_counted(self, number: Optional[int]) -> None:
+        assert self._loop is not None
+        count = await _run_in_thread(self._loop, len, self.pages)
+        self._jump_task = None
+        self._show_status("")
+        target = self._page_number_target(number, count)
+        if target != self.current:
+            self._go(target)
+
+    def _edit_query(self, key: str, target: int) -> int:
+        """Apply ``key`` to the search prompt; returns the (possibly new) target page."""
+        assert self._query is not None
+        if key in ("\n", "\r"):
+            query = self._query or self._last_query
+            self._query = None
+            if not query:
+                self._show_status("")
+                return target
+            self._last_query = query
+            return self._search(query, target, 1)
+        if key == "\x1b" or (key in BACKSPACE_KEYS and not self._query):  # Esc cancels
+            self._query = None
+            self._show_status("")
+            return target
+        if key in BACKSPACE_KEYS:
+            self._query = self._query[:-1]
+        elif len(key) == 1 and key.isprintable():
+            self._query += key
+        self._show_status("/" + self._query)
+        return target
+
+    def _search(self, query: str, target: int, step: int) -> int:
+        """Target page of the next (``step`` 1) or previous (-1) match of ``query``."""
+        if self._pending_index() is not None:
+            # Still indexing: jump from wherever the reader is once it is done
+            self._show_status(f"/{query}  (indexing...)")
+            self._start_jump(self._search_when_indexed(query, step))
+            return target
+        index = self.page_index
+        found = index.next_match(query, target, step) if index is not None else None
+        if index is None or found is None:
+            partial = hasattr(self.pages, "loaded") and not getattr(self.pages, "done", True)
+            self._pending_status = f"Not found: {query}" + (" (in the modules loaded so far)" if partial else "")
+            return target
+        matches = index.search(query)
+        entry = index.entries[found]
+        where = " · ".join(filter(None, (self._section(found), entry.origin, entry.title)))
+        self._pending_status = (
+            f"/{query}  [{matches.index(found) + 1}/{len(matches)}]  page {found + 1}/{len(index)}  {where}"
+        )
+        return found
+
+    def _pending_index(self) -> Optional[asyncio.Future]:
+        """Index work to wait for before searching, or None when the index is up to date.
+
+        Pages of lazily loaded course modules that arrived since the index was
+        built are added on a worker thread.
+        """
+        if self._index_future is not None and not self._index_future.done():
+            return self._index_future
+        index = self.page_index
+        loaded = getattr(self.pages, "loaded", None)
+        if index is None or loaded is None or len(loaded) <= len(index):
+            return None
+        assert self._loop is not None
+        self._index_future = _run_in_thread(self._loop, index.extend, loaded[len(index):])
+        return self._index_future
+
+    async def _search_when_indexed(self, query: str, step: int) -> None:
+        import asyncio
+
+        pending = self._pending_index()
+        while pending is not None:
+            # Not cancelled with this task: the index is shared
+            await asyncio.wait({pending})
+            pending = self._pending_index()
+        self._jump_task = None
+        target = self._search(query, self.current, step)
+        if target != self.current:
+            self._go(target)
+        elif self._pending_status is not None:
+            self._show_status(self._pending_status)
+            self._pending_status = None
+
+    def _index_built(self, fut: asyncio.Future) -> None:
+        if not fut.cancelled() and fut.exception() is None:
+            self.page_index = fut.result()
+
+    def _show_status(self, text: str) -> None:
+        width = self.console.size.width
+        line = Text(text, no_wrap=True)
+        line.truncate(max(width - 1, 0))
+        self.screen.status(line.plain)
+
+    def _on_resize(self) -> None:
+        assert self._loop is not None
+        if self._resize_timer is not None:
+            self._resize_timer.cancel()
+        if self.resize_quiet <= 0:
+            self._resize_settled()
+            return
+        # Work for the old size is useless now; show a placeholder until the size settles
+        if self._render_task is not None and not self._render_task.done():
+            self._render_task.cancel()
+        self.prefetcher.invalidate()
+        self.screen.present_clipped(self.console.size.height)
+        self._resize_timer = self._loop.call_later(self.resize_quiet, self._resize_settled)
+
+    def _resize_settled(self) -> None:
+        self._resize_timer = None
+        self.request_render()
+
+    async def run(self) -> None:
+        import asyncio
+
+        self._loop = asyncio.get_running_loop()
+        self._done = asyncio.Event()
+        self.request_render()
+        if not sys.stdin.isatty():
+            if self._render_task is not None:
+                await self._render_task
+            return
+        fd = sys.stdin.fileno()
+        old_settings = termios.tcgetattr(fd)
+        previous_handler = None
+        if self.page_index is None:
+            from utils.page_index import build_page_index
+
+            # For lazily loaded pages only what is loaded so far; ``_search`` adds the rest
+            pages = getattr(self.pages, "loaded", self.pages)
+            self._index_future = _run_in_thread(self._loop, build_page_index, pages)
+            self._index_future.add_done_callback(self._index_built)
+        try:
+            # cbreak gives immediate char delivery but retains ISIG so Ctrl-C still works
+            tty.setcbreak(fd)
+            self._loop.add_reader(fd, self._on_input, fd)
+            try:
+                previous_handler = signal.getsignal(signal.SIGWINCH)
+                self._loop.add_signal_handler(signal.SIGWINCH, self._on_resize)
+            except (AttributeError, NotImplementedError, RuntimeError):  # pragma: no cover
+                previous_handler = None
+            await self._done.wait()
+        finally:
+            self._loop.remove_reader(fd)
+            if previous_handler is not None:
+                self._loop.remove_signal_handler(signal.SIGWINCH)
+                try:  # pragma: no cover - best effort restore
+                    signal.signal(signal.SIGWINCH, previous_handler)
+                except Exception:
+                    pass
+            if self._render_task is not None:
+                self._render_task.cancel()
+            if self._resize_timer is not None:
+                self._resize_timer.cancel()
+            termios.tcsetattr(fd, termios.TCSADRAIN, old_settings)
+
+    def close(self) -> None:
+        self.prefetcher.close()
+        self.screen.invalidate()  # release any frame-store view still referenced
+
+
+def interactive_page_loop(
+    console: Console,
+    pages: Sequence[Page],
+    *,
+    frame_cache: Optional[FrameCache] = None,
+    frame_store: Optional[FrameStore] = None,
+    resize_quiet: float = DEFAULT_RESIZE_QUIET,
+    page_index: Optional[PageIndex] = None,
+    start: int = 0,
+    checkpoint: Optional[Checkpoint] = None,
+) -> None:
+    """Show ``pages`` one at a time, from page ``start``, until the user leaves.
+
+    ``resize_quiet`` is the debounce window (seconds) for terminal resizes;
+    0 re-renders on every SIGWINCH. ``page_index`` is a prebuilt index of
+    ``pages`` for search; without one it is built when the session starts.
+    ``checkpoint`` records the page after every navigation (see
+    ``utils.checkpoint``).
+    """
+    if not _has_page(pages, 0):
+        console.print("[red]No content pages found.[/red]")
+        return
+
+    import asyncio
+
+    engine = _PageEngine(
+        console,
+        pages,
+        frame_cache=frame_cache,
+        frame_store=frame_store,
+        resize_quiet=resize_quiet,
+        page_index=page_index,
+        start=start,
+        checkpoint=checkpoint,
+    )
+    try:
+        asyncio.run(engine.run())
     except KeyboardInterrupt:
         pass
     finally:
-        if previous_handler is not None:  # restore previous handler
-            try:  # pragma: no cover - best effort restore
-                signal.signal(signal.SIGWINCH, previous_handler)  # type: ignore[arg-type]
-            except Exception:
-                pass
+        engine.close()
 
 
-def main():
-    try:
-        with open('/challenge/.config', 'r') as file:
-            challengeId = file.read()\
-                .replace("\n", "")\
-                .replace("\r", "")\
-                .replace(" ", "")
-    except FileNotFoundError:
-        print("Error: The file /challenge/.config was not found.")
+CARD_EXIT_OK = 0
+CARD_EXIT_ERROR = 1
+CARD_EXIT_MISSING = 3
+
+
+def load_card(contents_root: Path) -> tuple[Optional[Page], str]:
+    """Locate a module's card without building the rest of its pages."""
+    return load_module_page(contents_root, "card")
+
+
+def _report_card_status(enabled: bool, status: str, contents_root: Path, **fields: Any) -> None:
+    """Emit a single JSON status line on stderr for machine consumers (``--json``)."""
+    if not enabled:
         return
+    payload = {"status": status, "module": contents_root.name, **fields}
+    print(json.dumps(payload, ensure_ascii=False), file=sys.stderr, flush=True)
+
+
+def run_card_mode(console: Console, contents_root: Path, *, json_status: bool = False) -> int:
+    """Render only the module card; return a CARD_EXIT_* code."""
+    try:
+        page, source = load_card(contents_root)
     except Exception as e:
-        print(f"An error occurred: {e}")
-        return
-    
+        console.print(f"[red]Failed to load card from {contents_root}: {e}[/red]")
+        _report_card_status(json_status, "error", contents_root, error=str(e))
+        return CARD_EXIT_ERROR
+    if page is None:
+        console.print(f"[red]Error: __card__ not defined for {contents_root.name}[/red]")
+        _report_card_status(json_status, "missing", contents_root, source=source)
+        return CARD_EXIT_MISSING
+    size = console.size
+    inner_width, inner_height = inner_size(size.width, size.height)
+    try:
+        renderable = page.render(inner_width, inner_height)
+    except Exception as e:
+        _wrap_and_print(console, Text(f"[red]Error rendering card: {e}[/red]"))
+        _report_card_status(json_status, "error", contents_root, source=source, error=str(e))
+        return CARD_EXIT_ERROR
+    _wrap_and_print(console, renderable)
+    _report_card_status(json_status, "ok", contents_root, source=source)
+    return CARD_EXIT_OK
+
+
+def run_session(
+    challenge_id: str,
+    argv: Sequence[str],
+    *,
+    preloaded: Optional[tuple[Sequence[Page], bool]] = None,
+) -> None:
+    """Run one session for ``challenge_id`` on the process's stdin/stdout.
+
+    ``preloaded`` is (pages, show_splash) already loaded for that challenge
+    (see ``utils.server``); without it, pages load on a background thread.
+    A valid checkpoint (see ``utils.checkpoint``) resumes on its page and
+    skips the splash screen. With ``--course`` the session covers every
+    module of ``contents/course.json`` (see ``utils.course``).
+    """
+    set_session_value("challenge", challenge_id)
+
     os.system('cls' if os.name == 'nt' else 'clear')
     console = Console()
     hide_cursor = sys.stdout.isatty()
@@ -325,54 +809,66 @@ def main():
         if hide_cursor:
             sys.stdout.write(ANSI_HIDE_CURSOR)
             sys.stdout.flush()
-        contents_root = Path(__file__).parent / "contents" / challengeId
+        contents_root = Path(__file__).parent / "contents" / challenge_id
         # --- Card mode: render only __card__ and exit ---
-        if "--card" in sys.argv:
-            export_path = contents_root / "export.py"
-            if not export_path.exists():
-                console.print(f"[red]export.py not found under {contents_root}[/red]")
-                sys.exit(1)
+        if "--card" in argv:
+            code = run_card_mode(console, contents_root, json_status="--json" in argv)
+            if code != CARD_EXIT_OK:
+                sys.exit(code)
+            return
+        frame_store: Optional[FrameStore] = None
+        if "--course" in argv:
+            # Frame stores hold per-module page numbers, so course sessions render live
+            manifest = contents_root.parent / COURSE_MANIFEST
             try:
-                mod = _import_module_from_path(export_path)
-            except Exception as e:
-                console.print(f"[red]Failed to import card from {export_path}: {e}[/red]")
-                sys.exit(1)
-            card = getattr(mod, "__card__", None)
-            if not card:
-                console.print("[red]Error: __card__ not defined in export.py[/red]")
-                sys.exit(1)
-            # Normalize to Page protocol
-            if hasattr(card, "render") and callable(getattr(card, "render")):
-                page = cast(Page, card)
-            elif isinstance(card, dict) and "__markdown__" in card:
-                md_src = str(card["__markdown__"]).rstrip("\n")
-                page = pages_mod.markdown_page(md_src)
-            elif isinstance(card, list):
-                safe_lines = [str(line) for line in card]
-                page = pages_mod.lines_page(safe_lines)
+                course = load_course(manifest)
+            except (OSError, ValueError) as e:
+                console.print(f"[red]Failed to load course manifest {manifest}: {e}[/red]")
+                return
+            course_source = CourseSource(course, contents_root.parent, load_module_pages)
+            pages, splash = course_source, course.splash
+            checkpoint: Checkpoint = CourseCheckpoint(course_source)
+        else:
+            if preloaded is not None:
+                pages, splash = preloaded
             else:
-                console.print("[red]Error: __card__ has unsupported type[/red]")
-                sys.exit(1)
-            size = console.size
-            inner_height = max(size.height - 1 - 2, 0)
-            inner_width = max(size.width - 6, 10)
-            try:
-                renderable = page.render(inner_width, inner_height)
-            except Exception as e:
-                renderable = Text(f"[red]Error rendering card: {e}[/red]")
-                _wrap_and_print(console, renderable)
-                sys.exit(1)
-            _wrap_and_print(console, renderable)
-            return
-        pages, any_show_splash = load_pages(contents_root)
-        if any_show_splash:
+                # Pages load on a background thread; page 0 can be drawn before the rest is ready
+                source = PageSource(iter_module_pages(contents_root))
+                pages, splash = source, source.show_splash
+            frame_store = open_framestore(contents_root, color_system=console.color_system)
+            checkpoint = Checkpoint(challenge_id, contents_root)
+        resume = checkpoint.load()
+        if splash and resume is None:
             show_splash(console)
-        interactive_page_loop(console, pages)
+        try:
+            interactive_page_loop(
+                console,
+                pages,
+                frame_store=frame_store,
+                start=resume or 0,
+                checkpoint=checkpoint,
+            )
+        finally:
+            if frame_store is not None:
+                frame_store.close()
     finally:
         if hide_cursor:
             sys.stdout.write(ANSI_SHOW_CURSOR)
             sys.stdout.flush()
 
 
+def main():
+    try:
+        challengeId = read_challenge_id()
+    except FileNotFoundError:
+        print(f"Error: The file {CHALLENGE_CONFIG} was not found.")
+        return
+    except Exception as e:
+        print(f"An error occurred: {e}")
+        return
+
+    run_session(challengeId, sys.argv)
+
+
 if __name__ == "__main__":
     main()
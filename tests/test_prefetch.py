@@ -0,0 +1,58 @@
+"""Tests for ``utils.prefetch``; run with ``python -m unittest`` from the repository root."""
+
+from __future__ import annotations
+
+import threading
+import unittest
+
+from utils.frames import EncodedFrame, FrameCache
+from utils.pages import lines_page
+from utils.prefetch import Prefetcher
+
+
+class _GatedRender:
+    """Render function that blocks on ``release`` and counts calls per page."""
+
+    def __init__(self) -> None:
+        self.started = threading.Event()
+        self.release = threading.Event()
+        self.calls: dict[object, int] = {}
+
+    def __call__(self, page, width: int, height: int) -> EncodedFrame:
+        self.calls[page] = self.calls.get(page, 0) + 1
+        self.started.set()
+        self.release.wait(5)
+        return EncodedFrame(f"frame {id(page)} {width}x{height}")
+
+
+class PrefetcherTest(unittest.TestCase):
+    def setUp(self) -> None:
+        self.cache = FrameCache()
+        self.render = _GatedRender()
+        self.prefetcher = Prefetcher(self.cache, self.render)
+        self.addCleanup(self.prefetcher.close)
+        self.addCleanup(self.render.release.set)
+
+    def test_result_kept_when_dropped_page_is_wanted_again(self) -> None:
+        p1, p2 = lines_page(["one"]), lines_page(["two"])
+        self.prefetcher.schedule([p2], 80, 24)
+        self.assertTrue(self.render.started.wait(5))
+        self.prefetcher.schedule([p1], 80, 24)  # p2 no longer wanted
+        self.prefetcher.schedule([p2], 80, 24)  # ... and wanted again
+        self.render.release.set()
+        frame = self.prefetcher.wait_for((p2, 80, 24), timeout=5)
+        self.assertIsNotNone(frame)
+        self.assertEqual(self.render.calls[p2], 1)
+
+    def test_result_dropped_when_page_is_no_longer_wanted(self) -> None:
+        p1, p2 = lines_page(["one"]), lines_page(["two"])
+        self.prefetcher.schedule([p2], 80, 24)
+        self.assertTrue(self.render.started.wait(5))
+        self.prefetcher.schedule([], 80, 24)
+        self.render.release.set()
+        self.assertIsNone(self.prefetcher.wait_for((p2, 80, 24), timeout=5))
+        self.assertNotIn(p1, self.render.calls)
+
+
+if __name__ == "__main__":
+    unittest.main()
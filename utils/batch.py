@@ -0,0 +1,151 @@
+"""Headless batch rendering of every module at a list of terminal sizes.
+
+Renders every page of each content directory, plus its card and recap, at
+each size, on a process pool::
+
+    python -m utils.batch                              # validate everything
+    python -m utils.batch --out snapshots --format ansi --sizes 80x24,120x30
+    python -m utils.batch contents/pipes.pipes --fail-on-overflow
+
+Pages are loaded with ``load_pages`` (the card and recap are the module's
+``__card__`` and ``__recap__``, or their bundled copies) and rendered
+through the same ``render_frame`` path the engine uses, so what passes here
+renders the same in a session. Render errors and pages that overflow the terminal (and so
+scroll instead of fitting) are reported; the exit code is 1 when any page
+failed to render (or, with ``--fail-on-overflow``, overflowed).
+
+With ``--out``, each frame is written to ``OUT/<module>/<WxH>/<page>.txt``
+(plain text) or ``.ans`` (ANSI, byte-identical to what the engine writes for
+that color system), and a ``report.json`` summarizes the run.
+"""
+
+from __future__ import annotations
+
+import json
+import sys
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Sequence
+
+from .framestore import DEFAULT_SIZES, parse_sizes
+from .frames import render_frame
+from .loader import load_module_page, load_pages
+from .pages import Page
+
+FORMATS = {"text": (None, ".txt"), "ansi": ("truecolor", ".ans")}
+
+
+def _frame_rows(frame: str) -> int:
+    return frame.count("\n") + (0 if frame.endswith("\n") else 1)
+
+
+def _module_pages(content_dir: Path) -> List[tuple[str, Page]]:
+    pages, _ = load_pages(content_dir)
+    named = [(f"page-{i:03d}", page) for i, page in enumerate(pages)]
+    for kind in ("card", "recap"):
+        page, _ = load_module_page(content_dir, kind)
+        if page is not None:
+            named.append((kind, page))
+    return named
+
+
+def render_module(
+    content_dir: Path,
+    sizes: Sequence[tuple[int, int]],
+    fmt: str = "text",
+    out_dir: Optional[Path] = None,
+) -> Dict[str, Any]:
+    """Render one module at every size; return its report entry."""
+    color_system, suffix = FORMATS[fmt]
+    report: Dict[str, Any] = {"module": content_dir.name, "pages": 0, "errors": [], "overflows": []}
+    try:
+        named = _module_pages(content_dir)
+    except Exception as e:
+        report["errors"].append({"page": None, "size": None, "error": f"load failed: {e}"})
+        return report
+    report["pages"] = len(named)
+    for width, height in sizes:
+        size = f"{width}x{height}"
+        target = out_dir / content_dir.name / size if out_dir is not None else None
+        if target is not None:
+            target.mkdir(parents=True, exist_ok=True)
+        for name, page in named:
+            try:
+                frame = render_frame(page, width, height, color_system=color_system)
+            except Exception as e:
+                report["errors"].append({"page": name, "size": size, "error": f"{type(e).__name__}: {e}"})
+                continue
+            rows = _frame_rows(frame)
+            # The engine keeps the last terminal row for input
+            if rows > height - 1:
+                report["overflows"].append({"page": name, "size": size, "rows": rows, "available": height - 1})
+            if target is not None:
+                (target / (name + suffix)).write_text(frame, encoding="utf-8")
+    return report
+
+
+def render_all(
+    dirs: Sequence[Path],
+    sizes: Sequence[tuple[int, int]],
+    fmt: str = "text",
+    out_dir: Optional[Path] = None,
+    jobs: Optional[int] = None,
+) -> List[Dict[str, Any]]:
+    """Render ``dirs`` on a process pool (one task per module); reports in ``dirs`` order."""
+    from concurrent.futures import ProcessPoolExecutor
+
+    with ProcessPoolExecutor(max_workers=jobs) as pool:
+        futures = [pool.submit(render_module, d, sizes, fmt, out_dir) for d in dirs]
+        return [f.result() for f in futures]
+
+
+__all__ = ["FORMATS", "render_all", "render_module"]
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    import argparse
+    import time
+
+    parser = argparse.ArgumentParser(prog="python -m utils.batch", description=__doc__.splitlines()[0])
+    parser.add_argument("dirs", nargs="*", type=Path, help="content directories (default: every module under contents/)")
+    parser.add_argument(
+        "--sizes",
+        default=",".join(f"{w}x{h}" for w, h in DEFAULT_SIZES),
+        help="comma separated WIDTHxHEIGHT terminal sizes (default: %(default)s)",
+    )
+    parser.add_argument("--format", choices=sorted(FORMATS), default="text", help="snapshot format (default: %(default)s)")
+    parser.add_argument("--out", type=Path, help="write snapshots and report.json under this directory")
+    parser.add_argument("--jobs", type=int, default=None, help="worker processes (default: CPU count)")
+    parser.add_argument("--fail-on-overflow", action="store_true", help="exit 1 when a page overflows the terminal")
+    args = parser.parse_args(argv)
+
+    dirs: List[Path] = args.dirs
+    if not dirs:
+        contents_root = Path(__file__).resolve().parent.parent / "contents"
+        dirs = sorted(p.parent for p in contents_root.glob("*/export.py"))
+    sizes = parse_sizes(args.sizes)
+
+    started = time.perf_counter()
+    reports = render_all(dirs, sizes, args.format, args.out, args.jobs)
+    elapsed = time.perf_counter() - started
+
+    frames = errors = overflows = 0
+    for report in reports:
+        frames += report["pages"] * len(sizes)
+        errors += len(report["errors"])
+        overflows += len(report["overflows"])
+        for err in report["errors"]:
+            print(f"{report['module']}: {err['page'] or '-'} @ {err['size'] or '-'}: {err['error']}", file=sys.stderr)
+        for over in report["overflows"]:
+            print(
+                f"{report['module']}: {over['page']} @ {over['size']}: "
+                f"overflows ({over['rows']} rows, {over['available']} available)"
+            )
+    print(f"{len(dirs)} modules, {frames} frames in {elapsed:.2f}s: {errors} errors, {overflows} overflows")
+    if args.out is not None:
+        args.out.mkdir(parents=True, exist_ok=True)
+        (args.out / "report.json").write_text(json.dumps(reports, indent=2) + "\n", encoding="utf-8")
+    return 1 if errors or (args.fail_on_overflow and overflows) else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
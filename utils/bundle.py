@@ -0,0 +1,245 @@
+"""Precompiled content bundles.
+
+A bundle is a single JSON file written next to a module's ``export.py`` that
+holds the module metadata and its pages already split and normalized, so the
+engine can skip executing ``export.py`` and re-parsing markdown at startup.
+
+Build bundles ahead of time with::
+
+    python -m utils.bundle contents/pipes.pipes [contents/... ...]
+    python -m utils.bundle --all
+
+Bundles are keyed by a hash over every file in the content directory (plus
+``BUNDLE_VERSION``); a stale bundle is ignored at runtime and rebuilt by the
+command above, while fresh ones are skipped.
+"""
+
+from __future__ import annotations
+
+import json
+import os
+import sys
+from functools import lru_cache
+from pathlib import Path
+from typing import Any, Optional
+
+from .pages import (
+    LinesPage,
+    MarkdownPage,
+    Page,
+    _insert_space_after_punctuation,
+)
+
+BUNDLE_VERSION = 2
+BUNDLE_FILENAME = "export.bundle.json"
+# Build artifacts (bundle, frame store) share this prefix and are not hashed
+ARTIFACT_PREFIX = "export.bundle"
+
+
+class BundleError(Exception):
+    """Raised when a content directory cannot be compiled into a bundle."""
+
+
+class ContentBundle:
+    """Pages and metadata of one content directory, loaded from a bundle file."""
+
+    def __init__(
+        self,
+        module_name: str,
+        show_splash: bool,
+        pages: list[Page],
+        card: Optional[Page] = None,
+        recap: Optional[Page] = None,
+    ):
+        self.module_name = module_name
+        self.show_splash = show_splash
+        self.pages = pages
+        self.card = card
+        self.recap = recap
+
+
+@lru_cache(maxsize=64)
+def content_hash(content_dir: Path) -> str:
+    """Hash every file under ``content_dir`` (except build artifacts and bytecode).
+
+    Computed once per directory and process: a session checks the same hash
+    for the bundle, the frame store and the checkpoint.
+    """
+    import hashlib  # only needed when a bundle or frame store is present
+
+    h = hashlib.sha256(f"shell-dojo-bundle:{BUNDLE_VERSION}".encode())
+    for path in sorted(content_dir.rglob("*")):
+        if not path.is_file() or path.name.startswith(ARTIFACT_PREFIX) or path.suffix == ".pyc":
+            continue
+        rel = path.relative_to(content_dir).as_posix()
+        h.update(rel.encode("utf-8") + b"\0")
+        h.update(path.read_bytes())
+        h.update(b"\0")
+    return h.hexdigest()
+
+
+def bundle_path(content_dir: Path) -> Path:
+    return content_dir / BUNDLE_FILENAME
+
+
+# --- Serialization ---------------------------------------------------------
+
+def _encode_page(page: Page) -> dict[str, Any]:
+    if isinstance(page, LinesPage):
+        return {"kind": "lines", "lines": list(page._lines)}
+    if isinstance(page, MarkdownPage):
+        entry = _encode_markdown(page)
+        if page.origin:
+            entry["origin"] = page.origin
+        return entry
+    raise BundleError(f"page type {type(page).__name__} cannot be bundled")
+
+
+def _encode_markdown(page: MarkdownPage) -> dict[str, Any]:
+    src = page._src
+    if page._normalized:
+        return {"kind": "markdown", "source": src, "normalized": True}
+    template = page._template
+    if not template.is_static:
+        # Placeholders are substituted per session before normalization, so
+        # keep the raw source and let the page normalize at render time.
+        return {"kind": "markdown", "source": src, "normalized": False, "placeholders": sorted(template.names)}
+    return {"kind": "markdown", "source": _insert_space_after_punctuation(src), "normalized": True}
+
+
+def _decode_page(entry: dict[str, Any]) -> Page:
+    kind = entry.get("kind")
+    if kind == "lines":
+        return LinesPage(entry["lines"])
+    if kind == "markdown":
+        return MarkdownPage(entry["source"], normalized=bool(entry.get("normalized")), origin=entry.get("origin"))
+    raise BundleError(f"unknown page kind {kind!r}")
+
+
+def build_bundle(content_dir: Path, *, force: bool = False) -> bool:
+    """Compile ``content_dir`` into a bundle file.
+
+    Returns False when an up-to-date bundle already exists (and ``force`` is
+    not set), True when a new bundle was written.
+    """
+    # Imported here: utils.loader imports this module
+    from .loader import coerce_page, import_module_from_path
+
+    export_file = content_dir / "export.py"
+    if not export_file.exists():
+        raise BundleError(f"export.py not found under {content_dir}")
+    digest = content_hash(content_dir)
+    target = bundle_path(content_dir)
+    if not force and _read_bundle_header(target) == digest:
+        return False
+
+    mod = import_module_from_path(export_file)
+    raw_pages = getattr(mod, "__pages__", [])
+    if not isinstance(raw_pages, list):
+        raise BundleError(f"__pages__ in {export_file} is not a list")
+    pages = [page for page in (coerce_page(p) for p in raw_pages if p) if page is not None]
+
+    def encode_optional(value: Any) -> Optional[dict[str, Any]]:
+        if not value:
+            return None
+        page = coerce_page(value)
+        return _encode_page(page) if page is not None else None
+
+    data = {
+        "version": BUNDLE_VERSION,
+        "hash": digest,
+        "module_name": str(getattr(mod, "__module_name__", content_dir.name)),
+        "show_splash": bool(getattr(mod, "__show_splash__", False)),
+        "pages": [_encode_page(page) for page in pages],
+        "card": encode_optional(getattr(mod, "__card__", None)),
+        "recap": encode_optional(getattr(mod, "__recap__", None)),
+    }
+    tmp = target.with_name(target.name + ".tmp")
+    tmp.write_text(json.dumps(data, ensure_ascii=False), encoding="utf-8")
+    os.replace(tmp, target)
+    return True
+
+
+# --- Loading ---------------------------------------------------------------
+
+def _read_bundle_header(path: Path) -> Optional[str]:
+    data = _read_bundle_data(path)
+    return data.get("hash") if data else None
+
+
+def _read_bundle_data(path: Path) -> Optional[dict[str, Any]]:
+    try:
+        data = json.loads(path.read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        return None
+    if not isinstance(data, dict) or data.get("version") != BUNDLE_VERSION:
+        return None
+    return data
+
+
+def load_bundle(content_dir: Path) -> Optional[ContentBundle]:
+    """Load the bundle of ``content_dir`` if it exists and matches the content hash."""
+    path = bundle_path(content_dir)
+    if not path.exists():
+        return None
+    data = _read_bundle_data(path)
+    if data is None or data.get("hash") != content_hash(content_dir):
+        return None
+    try:
+        pages = [_decode_page(entry) for entry in data["pages"]]
+        card = _decode_page(data["card"]) if data.get("card") else None
+        recap = _decode_page(data["recap"]) if data.get("recap") else None
+    except (BundleError, KeyError, TypeError):
+        return None
+    return ContentBundle(
+        str(data.get("module_name", content_dir.name)),
+        bool(data.get("show_splash", False)),
+        pages,
+        card,
+        recap,
+    )
+
+
+__all__ = [
+    "BUNDLE_VERSION",
+    "BUNDLE_FILENAME",
+    "BundleError",
+    "ContentBundle",
+    "build_bundle",
+    "bundle_path",
+    "content_hash",
+    "load_bundle",
+]
+
+
+def main(argv: Optional[list[str]] = None) -> int:
+    import argparse
+
+    parser = argparse.ArgumentParser(prog="python -m utils.bundle", description=__doc__.splitlines()[0])
+    parser.add_argument("dirs", nargs="*", type=Path, help="content directories to compile")
+    parser.add_argument("--all", action="store_true", help="compile every directory under contents/")
+    parser.add_argument("--force", action="store_true", help="rebuild even when the bundle is fresh")
+    args = parser.parse_args(argv)
+
+    dirs: list[Path] = list(args.dirs)
+    if args.all:
+        contents_root = Path(__file__).resolve().parent.parent / "contents"
+        dirs.extend(sorted(p.parent for p in contents_root.glob("*/export.py")))
+    if not dirs:
+        parser.error("no content directories given")
+
+    status = 0
+    for content_dir in dirs:
+        try:
+            built = build_bundle(content_dir, force=args.force)
+        except Exception as e:
+            print(f"{content_dir}: failed ({e})", file=sys.stderr)
+            status = 1
+            continue
+        print(f"{content_dir}: {'built' if built else 'up to date'}")
+    return status
+
+
+if __name__ == "__main__":
+    sys.exit(main())
+
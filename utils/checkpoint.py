@@ -0,0 +1,115 @@
+"""Reading progress saved across sessions.
+
+The engine records the page a student is on (plus the terminal size) in a
+small JSON file in their home directory, so a session relaunched after a
+dropped connection resumes on that page without the splash screen. The
+record carries a fingerprint of the module's content (``content_hash``) and
+is ignored once the content changes. Writes go to a temporary file that is
+renamed over the old one, so a killed session never leaves a torn file.
+
+``SHELL_DOJO_CHECKPOINT`` overrides the file location.
+"""
+
+from __future__ import annotations
+
+import json
+import os
+from pathlib import Path
+from typing import Any, Dict, Optional
+
+from .bundle import content_hash
+
+CHECKPOINT_ENV = "SHELL_DOJO_CHECKPOINT"
+CHECKPOINT_FILENAME = ".shell-dojo-checkpoint.json"
+
+
+def checkpoint_path() -> Path:
+    override = os.environ.get(CHECKPOINT_ENV)
+    return Path(override) if override else Path.home() / CHECKPOINT_FILENAME
+
+
+class Checkpoint:
+    """Saved position of one challenge's session (see module docstring).
+
+    ``fingerprint`` replaces the content hash of ``content_dir`` when given.
+    Subclasses that record the position differently override ``_position``
+    and ``_page``.
+    """
+
+    def __init__(
+        self,
+        challenge: str,
+        content_dir: Path,
+        path: Optional[Path] = None,
+        *,
+        fingerprint: Optional[str] = None,
+    ):
+        self.challenge = challenge
+        self.content_dir = content_dir
+        self.path = path if path is not None else checkpoint_path()
+        self._fingerprint = fingerprint
+        self._saved: Optional[tuple[int, int, int]] = None
+
+    @property
+    def fingerprint(self) -> str:
+        if self._fingerprint is None:
+            self._fingerprint = content_hash(self.content_dir)
+        return self._fingerprint
+
+    def _position(self, page: int) -> Dict[str, Any]:
+        """The fields recording ``page``."""
+        return {"page": page, "fingerprint": self.fingerprint}
+
+    def _page(self, data: Dict[str, Any]) -> Optional[int]:
+        """The page recorded in ``data``, or None when it no longer applies."""
+        page = data.get("page")
+        if not isinstance(page, int) or page < 0:
+            return None
+        if data.get("fingerprint") != self.fingerprint:
+            return None
+        return page
+
+    def load(self) -> Optional[int]:
+        """The saved page number, or None when there is no valid checkpoint."""
+        try:
+            data = json.loads(self.path.read_text(encoding="utf-8"))
+        except (OSError, ValueError):
+            return None
+        if not isinstance(data, dict) or data.get("challenge") != self.challenge:
+            return None
+        try:
+            page = self._page(data)
+        except OSError:
+            return None
+        if page is None:
+            return None
+        self._saved = (page, data.get("width"), data.get("height"))
+        return page
+
+    def save(self, page: int, width: int, height: int) -> None:
+        """Record ``page`` (skipped when nothing changed); failures are ignored."""
+        if self._saved == (page, width, height):
+            return
+        tmp = self.path.with_name(f"{self.path.name}.{os.getpid()}.tmp")
+        try:
+            data = {"challenge": self.challenge, "width": width, "height": height, **self._position(page)}
+            tmp.write_text(json.dumps(data), encoding="utf-8")
+            os.replace(tmp, self.path)
+        except OSError:
+            try:
+                tmp.unlink()
+            except OSError:
+                pass
+            return
+        self._saved = (page, width, height)
+
+    def clear(self) -> None:
+        """Forget the saved position (e.g. once the module was read to the end)."""
+        self._saved = None
+        try:
+            self.path.unlink()
+        except OSError:
+            pass
+
+
+__all__ = ["CHECKPOINT_ENV", "Checkpoint", "checkpoint_path"]
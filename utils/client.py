@@ -0,0 +1,124 @@
+"""Thin client for the pre-forking session server (see ``utils.server``).
+
+Drop-in replacement for running ``main.py``::
+
+    python -m utils.client [--card [--json]]
+
+It reads the challenge id, hands stdin/stdout/stderr to the server together
+with argv and the terminal-related environment, forwards SIGWINCH and SIGINT
+while the session runs and exits with the session's exit code. Only the
+standard library and the lightweight ``utils.server``, ``utils.template`` and
+``utils.trace`` are imported (not the engine), so starting the client costs
+little more than starting the interpreter. When no server is listening
+(or it declines the session) the engine runs in-process as before. The
+terminal is only handed to a server owned by root or by the current user.
+"""
+
+from __future__ import annotations
+
+import json
+import os
+import signal
+import socket
+import struct
+import sys
+from typing import List, Optional, Sequence
+
+from .server import DEFAULT_SOCKET, SESSION_ENV
+from .template import CHALLENGE_CONFIG, read_challenge_id
+
+FORWARDED_SIGNALS = (signal.SIGWINCH, signal.SIGINT)
+
+
+def _run_local(argv: Sequence[str]) -> int:
+    repo_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    if repo_root not in sys.path:
+        sys.path.insert(0, repo_root)
+    import main
+
+    sys.argv = ["main.py", *argv]
+    main.main()
+    return 0
+
+
+def _trusted(sock: socket.socket) -> bool:
+    """Whether the listener on ``sock`` runs as root or as this user."""
+    try:
+        creds = sock.getsockopt(socket.SOL_SOCKET, socket.SO_PEERCRED, struct.calcsize("3i"))
+    except OSError:
+        return False
+    _, uid, _ = struct.unpack("3i", creds)
+    return uid in (0, os.getuid())
+
+
+def _read_line(sock: socket.socket) -> Optional[str]:
+    buf = b""
+    while not buf.endswith(b"\n"):
+        data = sock.recv(4096)
+        if not data:
+            return None
+        buf += data
+    return buf.decode("utf-8", errors="replace").strip()
+
+
+def run_client(argv: Sequence[str], socket_path: str = DEFAULT_SOCKET) -> int:
+    """Run a session through the server at ``socket_path``; return its exit code."""
+    try:
+        challenge_id = read_challenge_id()
+    except FileNotFoundError:
+        print(f"Error: The file {CHALLENGE_CONFIG} was not found.")
+        return 0
+    except Exception as e:
+        print(f"An error occurred: {e}")
+        return 0
+
+    sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    try:
+        sock.connect(socket_path)
+    except OSError:
+        sock.close()
+        return _run_local(argv)
+    if not _trusted(sock):
+        # Anyone can create a socket at a world-writable path; never pass them the terminal
+        sock.close()
+        return _run_local(argv)
+
+    request = {
+        "challenge": challenge_id,
+        "argv": ["main.py", *argv],
+        "cwd": os.getcwd(),
+        "env": {key: os.environ[key] for key in SESSION_ENV if key in os.environ},
+    }
+    sys.stdout.flush()
+    sys.stderr.flush()
+    with sock:
+        socket.send_fds(sock, [json.dumps(request).encode("utf-8")], [0, 1, 2])
+
+        def forward(signum: int, frame: object) -> None:
+            try:
+                sock.sendall(f"signal {signum}\n".encode("ascii"))
+            except OSError:
+                pass
+
+        previous = {sig: signal.signal(sig, forward) for sig in FORWARDED_SIGNALS}
+        try:
+            reply = _read_line(sock)
+        finally:
+            for sig, handler in previous.items():
+                signal.signal(sig, handler)
+    if reply is None:
+        return 1
+    kind, _, value = reply.partition(" ")
+    if kind == "exit":
+        return int(value) if value.lstrip("-").isdigit() else 1
+    # The server declined (e.g. a module it has not preloaded)
+    return _run_local(argv)
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    args = sys.argv[1:] if argv is None else argv
+    return run_client(args)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
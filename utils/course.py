@@ -0,0 +1,233 @@
+"""Course mode: every module of a course in one session.
+
+A course is described by a JSON manifest (``contents/course.json``)::
+
+    {"title": "...", "splash": true,
+     "modules": [{"id": "intro.intro", "title": "Why Shell?"}, ...]}
+
+where each ``id`` names a directory under ``contents/``. ``CourseSource``
+presents the modules as one page sequence but loads a module (its bundle or
+``export.py``) only when the reader gets to it; a background thread loads
+the module after the one being read, so moving on does not wait. Starting a
+course loads just the first module and its successor, however long the
+course is.
+
+``CourseCheckpoint`` saves the reader's position as a module id and a page
+within that module, checked against that module's content hash, so editing
+one module (or the manifest) does not lose progress made in another.
+"""
+
+from __future__ import annotations
+
+import json
+import threading
+from bisect import bisect_right
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple, overload
+
+from . import trace
+from .bundle import content_hash
+from .checkpoint import Checkpoint
+from .pages import Page
+
+COURSE_MANIFEST = "course.json"
+
+# Loads one module directory's export.py: (show_splash, pages), or None when it cannot be loaded
+ModuleLoader = Callable[[Path], Optional[Tuple[bool, Sequence[Page]]]]
+
+
+class CourseModule:
+    """One manifest entry."""
+
+    __slots__ = ("id", "title")
+
+    def __init__(self, id: str, title: str):
+        self.id = id
+        self.title = title
+
+
+class Course:
+    """A parsed course manifest."""
+
+    def __init__(self, path: Path, title: str, modules: Sequence[CourseModule], splash: bool = False):
+        self.path = path
+        self.title = title
+        self.modules = list(modules)
+        self.splash = splash
+
+
+def load_course(path: Path) -> Course:
+    """Parse the manifest at ``path``; raises ``ValueError`` when it is malformed."""
+    data = json.loads(path.read_text(encoding="utf-8"))
+    entries = data.get("modules") if isinstance(data, dict) else None
+    if not isinstance(entries, list) or not entries:
+        raise ValueError(f"{path}: 'modules' must be a non-empty list")
+    modules = []
+    for entry in entries:
+        if isinstance(entry, str):
+            entry = {"id": entry}
+        if not isinstance(entry, dict) or not isinstance(entry.get("id"), str):
+            raise ValueError(f"{path}: every module needs an 'id'")
+        modules.append(CourseModule(entry["id"], str(entry.get("title", entry["id"]))))
+    return Course(path, str(data.get("title", path.parent.name)), modules, bool(data.get("splash", False)))
+
+
+class CourseSource(Sequence[Page]):
+    """The pages of every course module, loaded in order on a background thread.
+
+    Modules load strictly in manifest order (a page's position depends on
+    the page counts before it). The loader stops ``lookahead`` modules past
+    the one last read from; indexing further waits while the loader catches
+    up, and ``len`` loads the whole course.
+    """
+
+    def __init__(self, course: Course, contents_root: Path, load_module: ModuleLoader, *, lookahead: int = 1):
+        self.course = course
+        self._root = contents_root
+        self._load_module = load_module
+        self._lookahead = max(lookahead, 0)
+        self._pages: List[Page] = []
+        # First flat index of every loaded module
+        self._starts: List[int] = []
+        self._wanted = 1 + self._lookahead
+        self._error: BaseException | None = None
+        self._cond = threading.Condition()
+        self._thread = threading.Thread(target=self._run, name="course-loader", daemon=True)
+        self._thread.start()
+
+    @property
+    def _done(self) -> bool:
+        return len(self._starts) == len(self.course.modules)
+
+    def _run(self) -> None:
+        try:
+            for module in self.course.modules:
+                with self._cond:
+                    self._cond.wait_for(lambda: len(self._starts) < self._wanted)
+                export_file = self._root / module.id / "export.py"
+                with trace.span("course.load_module", module=module.id):
+                    loaded = self._load_module(export_file) if export_file.exists() else None
+                pages = list(loaded[1]) if loaded is not None else []
+                with self._cond:
+                    self._starts.append(len(self._pages))
+                    self._pages.extend(pages)
+                    self._cond.notify_all()
+        except BaseException as e:  # pragma: no cover - surfaced to the reader
+            with self._cond:
+                self._error = e
+                self._starts.extend([len(self._pages)] * (len(self.course.modules) - len(self._starts)))
+                self._cond.notify_all()
+
+    def _want(self, modules: int) -> None:
+        # Caller holds the condition
+        if modules > self._wanted:
+            self._wanted = modules
+            self._cond.notify_all()
+
+    def _wait_for_page(self, index: int) -> None:
+        with self._cond:
+            while index >= len(self._pages) and not self._done:
+                self._want(len(self._starts) + 1)
+                self._cond.wait()
+            if index < len(self._pages):
+                # Reading module k: keep the next ``lookahead`` modules coming
+                self._want(bisect_right(self._starts, index) + self._lookahead)
+        if self._error is not None:
+            raise self._error
+
+    @property
+    def done(self) -> bool:
+        """Whether every module has been loaded."""
+        return self._done
+
+    @property
+    def loaded(self) -> List[Page]:
+        """The pages of the modules loaded so far."""
+        with self._cond:
+            return list(self._pages)
+
+    def locate(self, index: int) -> Optional[Tuple[CourseModule, int]]:
+        """The manifest entry page ``index`` belongs to and its page number there (None when not loaded)."""
+        with self._cond:
+            if not 0 <= index < len(self._pages):
+                return None
+            k = bisect_right(self._starts, index) - 1
+            return self.course.modules[k], index - self._starts[k]
+
+    def index_of(self, module_id: str, page: int) -> Optional[int]:
+        """Flat index of page ``page`` of module ``module_id``; waits until that module is loaded.
+
+        None when the course has no such module or the module has no such page.
+        """
+        k = next((i for i, module in enumerate(self.course.modules) if module.id == module_id), None)
+        if k is None or page < 0:
+            return None
+        with self._cond:
+            self._want(k + 1 + self._lookahead)
+            self._cond.wait_for(lambda: len(self._starts) > k)
+            start = self._starts[k]
+            end = self._starts[k + 1] if k + 1 < len(self._starts) else len(self._pages)
+        if self._error is not None:
+            raise self._error
+        return start + page if start + page < end else None
+
+    def module_at(self, index: int) -> Optional[CourseModule]:
+        """The manifest entry page ``index`` belongs to (None when not loaded)."""
+        found = self.locate(index)
+        return found[0] if found is not None else None
+
+    def section_title(self, index: int) -> Optional[str]:
+        module = self.module_at(index)
+        return module.title if module is not None else None
+
+    def __len__(self) -> int:
+        with self._cond:
+            self._want(len(self.course.modules))
+            self._cond.wait_for(lambda: self._done)
+        if self._error is not None:
+            raise self._error
+        return len(self._pages)
+
+    @overload
+    def __getitem__(self, index: int) -> Page: ...
+
+    @overload
+    def __getitem__(self, index: slice) -> Sequence[Page]: ...
+
+    def __getitem__(self, index):
+        if isinstance(index, slice) or index < 0:
+            len(self)
+            return self._pages[index]
+        self._wait_for_page(index)
+        return self._pages[index]
+
+
+class CourseCheckpoint(Checkpoint):
+    """Checkpoint of a course session: module id, page within it and that module's hash."""
+
+    def __init__(self, source: CourseSource, path: Optional[Path] = None):
+        super().__init__("course", source._root, path)
+        self.source = source
+
+    def _module_hash(self, module_id: str) -> str:
+        return content_hash(self.source._root / module_id)
+
+    def _position(self, page: int) -> Dict[str, Any]:
+        found = self.source.locate(page)
+        if found is None:
+            raise OSError(f"page {page} is not loaded")
+        module, local = found
+        return {"module": module.id, "page": local, "fingerprint": self._module_hash(module.id)}
+
+    def _page(self, data: Dict[str, Any]) -> Optional[int]:
+        module_id, local = data.get("module"), data.get("page")
+        if not isinstance(module_id, str) or not isinstance(local, int):
+            return None
+        if not any(module.id == module_id for module in self.source.course.modules):
+            return None
+        if data.get("fingerprint") != self._module_hash(module_id):
+            return None
+        return self.source.index_of(module_id, local)
+
+
+__all__ = ["COURSE_MANIFEST", "Course", "CourseCheckpoint", "CourseModule", "CourseSource", "load_course"]
@@ -0,0 +1,143 @@
+from __future__ import annotations
+
+import io
+import threading
+from collections import OrderedDict
+from typing import Hashable, Optional, Tuple
+
+from rich.console import Console, RenderableType
+from rich.panel import Panel
+
+from . import trace
+from .pages import Page
+from .screen import EncodedFrame
+
+FrameKey = Tuple[Hashable, int, int]
+
+
+def inner_size(width: int, height: int) -> tuple[int, int]:
+    """Return the (width, height) available to a page inside the engine panel.
+
+    Leaves the last terminal row for raw-key input and subtracts the panel
+    borders (2 columns, 2 rows) plus horizontal padding (4 columns).
+    """
+    return max(width - 6, 10), max(height - 1 - 2, 0)
+
+
+def render_renderable_frame(
+    renderable: RenderableType,
+    width: int,
+    height: int,
+    *,
+    color_system: Optional[str] = "truecolor",
+    border_style: str = "yellow",
+) -> str:
+    """Wrap ``renderable`` in the engine panel and return the finished ANSI frame."""
+    buf = io.StringIO()
+    console = Console(
+        file=buf,
+        width=width,
+        height=height,
+        force_terminal=True,
+        color_system=color_system,  # type: ignore[arg-type]
+        legacy_windows=False,
+    )
+    console.print(Panel(renderable, border_style=border_style, expand=True, padding=(0, 2)))
+    return buf.getvalue()
+
+
+def render_frame(
+    page: Page,
+    width: int,
+    height: int,
+    *,
+    color_system: Optional[str] = "truecolor",
+    border_style: str = "yellow",
+) -> str:
+    """Render ``page`` for a terminal of ``width`` x ``height`` into an ANSI frame."""
+    inner_width, inner_height = inner_size(width, height)
+    with trace.span("Page.render", page=type(page).__name__, width=width, height=height):
+        renderable = page.render(inner_width, inner_height)
+    with trace.span("rich.layout", width=width, height=height):
+        return render_renderable_frame(
+            renderable, width, height, color_system=color_system, border_style=border_style
+        )
+
+
+class FrameCache:
+    """Bounded LRU cache of finished frames keyed by (page, width, height).
+
+    Frames are stored encoded (``EncodedFrame``), ready to be written.
+    Eviction happens when either ``max_entries`` or ``max_bytes`` (the encoded
+    size of the stored frames) is exceeded. ``resize`` drops
+    every entry rendered for a different terminal size. All operations are
+    guarded by a lock so background renderers may fill the cache.
+    """
+
+    def __init__(self, max_entries: int = 64, max_bytes: int = 8 * 1024 * 1024):
+        self.max_entries = max(max_entries, 1)
+        self.max_bytes = max(max_bytes, 1)
+        self._frames: OrderedDict[FrameKey, EncodedFrame] = OrderedDict()
+        self._bytes = 0
+        self._size: Optional[tuple[int, int]] = None
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._frames)
+
+    def __contains__(self, key: FrameKey) -> bool:
+        with self._lock:
+            return key in self._frames
+
+    @property
+    def nbytes(self) -> int:
+        return self._bytes
+
+    def get(self, key: FrameKey) -> Optional[EncodedFrame]:
+        with self._lock:
+            frame = self._frames.get(key)
+            if frame is not None:
+                self._frames.move_to_end(key)
+            return frame
+
+    def put(self, key: FrameKey, frame: EncodedFrame) -> None:
+        if len(frame) > self.max_bytes:
+            return
+        with self._lock:
+            if self._size is not None and key[1:] != self._size:
+                return  # rendered for a size that is no longer current
+            old = self._frames.pop(key, None)
+            if old is not None:
+                self._bytes -= len(old)
+            self._frames[key] = frame
+            self._bytes += len(frame)
+            while len(self._frames) > self.max_entries or self._bytes > self.max_bytes:
+                _, evicted = self._frames.popitem(last=False)
+                self._bytes -= len(evicted)
+
+    def resize(self, width: int, height: int) -> bool:
+        """Invalidate all frames when the terminal size differs from the last one seen.
+
+        Returns True when the size changed (and the cache was cleared).
+        """
+        with self._lock:
+            if self._size == (width, height):
+                return False
+            self._size = (width, height)
+            self._frames.clear()
+            self._bytes = 0
+            return True
+
+    def clear(self) -> None:
+        with self._lock:
+            self._frames.clear()
+            self._bytes = 0
+
+
+__all__ = [
+    "EncodedFrame",
+    "FrameCache",
+    "inner_size",
+    "render_frame",
+    "render_renderable_frame",
+]
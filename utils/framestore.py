@@ -0,0 +1,217 @@
+"""On-disk store of pre-rendered ANSI frames.
+
+An offline step renders every page of a module at a list of common terminal
+sizes (wrapped in the same panel the engine uses) and writes the raw frames
+into a single indexed file next to ``export.py``::
+
+    python -m utils.framestore contents/pipes.pipes --sizes 80x24,120x30,160x45
+
+At runtime the engine memory-maps the file and writes a matching frame to the
+terminal straight from the mapping; sizes without a stored frame fall back to
+live rendering. Pages whose text depends on the session (e.g. ``[flag]`` or ``[user]``) are
+never stored.
+
+File layout (little endian)::
+
+    magic "SDFRAMES" | u32 version | u32 n_frames
+    u16 len + utf-8 color system | u16 len + utf-8 content hash
+    n_frames * (u32 page, u16 width, u16 height, u64 offset, u64 length)
+    frame bytes...
+"""
+
+from __future__ import annotations
+
+import mmap
+import os
+import struct
+import sys
+from pathlib import Path
+from typing import Iterable, Optional, Sequence
+
+from .bundle import content_hash
+from .frames import render_frame
+from .loader import load_pages
+from .pages import CompositePage, LinesPage, MarkdownPage, Page
+
+FRAMESTORE_FILENAME = "export.bundle.frames"
+FRAMESTORE_VERSION = 1
+DEFAULT_SIZES: list[tuple[int, int]] = [(80, 24), (120, 30), (160, 45)]
+DEFAULT_COLOR_SYSTEM = "truecolor"
+
+_MAGIC = b"SDFRAMES"
+_HEADER = struct.Struct("<8sII")
+_ENTRY = struct.Struct("<IHHQQ")
+_LEN = struct.Struct("<H")
+
+
+def framestore_path(content_dir: Path) -> Path:
+    return content_dir / FRAMESTORE_FILENAME
+
+
+def parse_sizes(spec: str) -> list[tuple[int, int]]:
+    """Parse ``"80x24,120x30"`` into ``[(80, 24), (120, 30)]``."""
+    sizes: list[tuple[int, int]] = []
+    for item in spec.split(","):
+        item = item.strip().lower()
+        if not item:
+            continue
+        w, _, h = item.partition("x")
+        sizes.append((int(w), int(h)))
+    return sizes
+
+
+def _page_is_static(page: Page) -> bool:
+    """True when the rendered page does not depend on per-session values."""
+    if isinstance(page, LinesPage):
+        return all(t.is_static for t in page._templates)
+    if isinstance(page, MarkdownPage):
+        return page._normalized or page._template.is_static
+    return isinstance(page, CompositePage)
+
+
+def build_framestore(
+    content_dir: Path,
+    sizes: Iterable[tuple[int, int]] = DEFAULT_SIZES,
+    *,
+    color_system: str = DEFAULT_COLOR_SYSTEM,
+) -> int:
+    """Render every static page of ``content_dir`` at ``sizes``; return the frame count."""
+    pages, _ = load_pages(content_dir)
+    index: list[tuple[int, int, int, int, int]] = []
+    blobs: list[bytes] = []
+    offset = 0
+    for page_index, page in enumerate(pages):
+        if not _page_is_static(page):
+            continue
+        for width, height in sizes:
+            frame = render_frame(page, width, height, color_system=color_system).encode("utf-8")
+            index.append((page_index, width, height, offset, len(frame)))
+            blobs.append(frame)
+            offset += len(frame)
+
+    color = color_system.encode("utf-8")
+    digest = content_hash(content_dir).encode("utf-8")
+    header = (
+        _HEADER.pack(_MAGIC, FRAMESTORE_VERSION, len(index))
+        + _LEN.pack(len(color)) + color
+        + _LEN.pack(len(digest)) + digest
+    )
+    data_start = len(header) + _ENTRY.size * len(index)
+    target = framestore_path(content_dir)
+    tmp = target.with_name(target.name + ".tmp")
+    with open(tmp, "wb") as f:
+        f.write(header)
+        for page_index, width, height, off, length in index:
+            f.write(_ENTRY.pack(page_index, width, height, data_start + off, length))
+        for blob in blobs:
+            f.write(blob)
+    os.replace(tmp, target)
+    return len(index)
+
+
+class FrameStore:
+    """Memory-mapped view of a frame store file."""
+
+    def __init__(self, path: Path):
+        with open(path, "rb") as f:
+            self._mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        self._view = memoryview(self._mm)
+        try:
+            magic, version, count = _HEADER.unpack_from(self._mm, 0)
+            if magic != _MAGIC or version != FRAMESTORE_VERSION:
+                raise ValueError(f"{path} is not a version {FRAMESTORE_VERSION} frame store")
+            pos = _HEADER.size
+            self.color_system, pos = self._read_str(pos)
+            self.content_hash, pos = self._read_str(pos)
+            self._index: dict[tuple[int, int, int], tuple[int, int]] = {}
+            for _ in range(count):
+                page_index, width, height, off, length = _ENTRY.unpack_from(self._mm, pos)
+                self._index[(page_index, width, height)] = (off, length)
+                pos += _ENTRY.size
+        except Exception:
+            self.close()
+            raise
+
+    def _read_str(self, pos: int) -> tuple[str, int]:
+        (n,) = _LEN.unpack_from(self._mm, pos)
+        pos += _LEN.size
+        return bytes(self._mm[pos:pos + n]).decode("utf-8"), pos + n
+
+    def __len__(self) -> int:
+        return len(self._index)
+
+    def lookup(self, page_index: int, width: int, height: int) -> Optional[memoryview]:
+        """Return a zero-copy view of the frame, or None when the size is not stored."""
+        entry = self._index.get((page_index, width, height))
+        if entry is None:
+            return None
+        off, length = entry
+        return self._view[off:off + length]
+
+    def close(self) -> None:
+        try:
+            self._view.release()
+            self._mm.close()
+        except (AttributeError, BufferError):  # pragma: no cover - outstanding views
+            pass
+
+
+def open_framestore(content_dir: Path, *, color_system: Optional[str]) -> Optional[FrameStore]:
+    """Open the frame store of ``content_dir`` if it is fresh and matches ``color_system``."""
+    path = framestore_path(content_dir)
+    if not color_system or not path.exists():
+        return None
+    try:
+        store = FrameStore(path)
+    except (OSError, ValueError, struct.error):
+        return None
+    if store.color_system != color_system or store.content_hash != content_hash(content_dir):
+        store.close()
+        return None
+    return store
+
+
+__all__ = [
+    "DEFAULT_SIZES",
+    "FRAMESTORE_FILENAME",
+    "FrameStore",
+    "build_framestore",
+    "framestore_path",
+    "open_framestore",
+    "parse_sizes",
+]
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    import argparse
+
+    parser = argparse.ArgumentParser(prog="python -m utils.framestore", description=__doc__.splitlines()[0])
+    parser.add_argument("dirs", nargs="+", type=Path, help="content directories to pre-render")
+    parser.add_argument(
+        "--sizes",
+        default=",".join(f"{w}x{h}" for w, h in DEFAULT_SIZES),
+        help="comma separated WIDTHxHEIGHT terminal sizes (default: %(default)s)",
+    )
+    parser.add_argument(
+        "--color-system",
+        default=DEFAULT_COLOR_SYSTEM,
+        choices=["standard", "256", "truecolor"],
+        help="color system the frames are rendered for (default: %(default)s)",
+    )
+    args = parser.parse_args(argv)
+    sizes = parse_sizes(args.sizes)
+
+    status = 0
+    for content_dir in args.dirs:
+        try:
+            count = build_framestore(content_dir, sizes, color_system=args.color_system)
+        except Exception as e:
+            print(f"{content_dir}: failed ({e})", file=sys.stderr)
+            status = 1
+            continue
+        print(f"{content_dir}: {count} frames")
+    return status
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,111 @@
+"""Import-time budget for the engine entry module.
+
+Every challenge launch is a fresh interpreter, so the cost of ``import main``
+is paid on every start. This tool measures it in clean subprocesses and checks
+it against a budget::
+
+    python -m utils.import_budget                 # check (exit 1 when over budget)
+    python -m utils.import_budget --breakdown 20  # also print the slowest imports
+
+The budget defaults to ``DEFAULT_BUDGET_MS`` and can be overridden with
+``--budget-ms`` or the ``SHELL_DOJO_IMPORT_BUDGET_MS`` environment variable.
+Markdown (markdown-it) and Syntax (Pygments) machinery must not be imported by
+``main`` at all; they are loaded when the first page that needs them renders.
+"""
+
+from __future__ import annotations
+
+import os
+import subprocess
+import sys
+from pathlib import Path
+from typing import Optional, Sequence
+
+DEFAULT_BUDGET_MS = 150.0
+DEFERRED_MODULES = ("rich.markdown", "rich.syntax", "markdown_it", "pygments")
+
+_REPO_ROOT = Path(__file__).resolve().parent.parent
+_TIMER = (
+    "import time; t = time.perf_counter(); import {module}; "
+    "print((time.perf_counter() - t) * 1000.0)"
+)
+
+
+def measure_import_ms(module: str = "main", *, runs: int = 5) -> float:
+    """Best-of-``runs`` wall time (ms) of importing ``module`` in a fresh interpreter."""
+    best = float("inf")
+    for _ in range(max(runs, 1)):
+        out = subprocess.run(
+            [sys.executable, "-c", _TIMER.format(module=module)],
+            cwd=_REPO_ROOT,
+            capture_output=True,
+            text=True,
+            check=True,
+        ).stdout
+        best = min(best, float(out.strip().splitlines()[-1]))
+    return best
+
+
+def import_breakdown(module: str = "main") -> list[tuple[str, int, int]]:
+    """Return (module, self_us, cumulative_us) rows from ``python -X importtime``."""
+    err = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        cwd=_REPO_ROOT,
+        capture_output=True,
+        text=True,
+        check=True,
+    ).stderr
+    rows: list[tuple[str, int, int]] = []
+    for line in err.splitlines():
+        if not line.startswith("import time:"):
+            continue
+        parts = line[len("import time:"):].split("|")
+        if len(parts) != 3 or not parts[0].strip().isdigit():
+            continue  # header line
+        rows.append((parts[2].strip(), int(parts[0]), int(parts[1])))
+    return rows
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    import argparse
+
+    parser = argparse.ArgumentParser(prog="python -m utils.import_budget", description=__doc__.splitlines()[0])
+    parser.add_argument("--module", default="main", help="module to import (default: %(default)s)")
+    parser.add_argument(
+        "--budget-ms",
+        type=float,
+        default=float(os.environ.get("SHELL_DOJO_IMPORT_BUDGET_MS", DEFAULT_BUDGET_MS)),
+        help="maximum allowed import time in milliseconds (default: %(default)s)",
+    )
+    parser.add_argument("--runs", type=int, default=5, help="measurements to take the best of")
+    parser.add_argument(
+        "--breakdown",
+        type=int,
+        default=0,
+        metavar="N",
+        help="print the N imports with the largest cumulative time",
+    )
+    args = parser.parse_args(argv)
+
+    rows = import_breakdown(args.module)
+    if args.breakdown:
+        print(f"{'cumulative ms':>14} {'self ms':>9}  module")
+        for name, self_us, cum_us in sorted(rows, key=lambda r: r[2], reverse=True)[: args.breakdown]:
+            print(f"{cum_us / 1000:14.2f} {self_us / 1000:9.2f}  {name}")
+        print()
+
+    status = 0
+    eager = sorted({name for name, _, _ in rows if name.startswith(DEFERRED_MODULES)})
+    if eager:
+        print(f"deferred modules imported eagerly: {', '.join(eager)}")
+        status = 1
+    elapsed = measure_import_ms(args.module, runs=args.runs)
+    verdict = "ok" if elapsed <= args.budget_ms else "OVER BUDGET"
+    print(f"import {args.module}: {elapsed:.1f} ms (budget {args.budget_ms:.1f} ms) {verdict}")
+    if elapsed > args.budget_ms:
+        status = 1
+    return status
+
+
+if __name__ == "__main__":
+    sys.exit(main())
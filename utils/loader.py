@@ -0,0 +1,130 @@
+"""Discovery and loading of content modules.
+
+Each module is a directory holding an ``export.py`` that declares its pages
+(``__pages__``), splash flag and optional ``__card__``/``__recap__``. A fresh
+precompiled bundle (see ``utils.bundle``) next to export.py is loaded instead
+of executing the module.
+"""
+
+from __future__ import annotations
+
+import importlib.util
+import sys
+from pathlib import Path
+from typing import Any, Iterator, Optional, cast
+
+from . import pages as pages_mod
+from . import trace
+from .bundle import load_bundle
+from .pages import Page
+
+
+@trace.traced("import_module")
+def import_module_from_path(path: Path):
+    spec = importlib.util.spec_from_file_location(path.stem, path)
+    if spec and spec.loader:
+        module = importlib.util.module_from_spec(spec)
+        spec.loader.exec_module(module)  # type: ignore[attr-defined]
+        return module
+    raise ImportError(f"Cannot import module from {path}")
+
+
+def coerce_page(p: Any) -> Optional[Page]:
+    """Normalize an exported page to the Page protocol (None if unsupported)."""
+    # New protocol: object with a callable .render(width,height)
+    if hasattr(p, "render") and callable(getattr(p, "render")):
+        return cast(Page, p)
+    if isinstance(p, dict) and "__markdown__" in p:  # legacy dict form
+        md_src = str(p["__markdown__"]).rstrip("\n")
+        return pages_mod.markdown_page(md_src)
+    if isinstance(p, list):  # legacy list-of-lines
+        safe_lines = [str(line) for line in p]
+        return pages_mod.lines_page(safe_lines)
+    return None
+
+
+def iter_module_pages(contents_root: Path) -> Iterator[tuple[bool, list[Page]]]:
+    """Yield (show_splash, pages) for every export.py module under contents."""
+    if not contents_root.exists():
+        return
+    export_files = set()
+    export_files.update(contents_root.glob("export.py"))
+    export_files.update(contents_root.glob("*/export.py"))  # nested version
+    for export_file in sorted(export_files):
+        with trace.span("load_module", module=export_file.parent.name):
+            loaded = load_module_pages(export_file)
+        if loaded is not None:
+            yield loaded
+
+
+def load_module_pages(export_file: Path) -> Optional[tuple[bool, list[Page]]]:
+    """(show_splash, pages) of one module, from its bundle or by importing export.py."""
+    bundle = load_bundle(export_file.parent)
+    if bundle is not None:
+        return bundle.show_splash, bundle.pages
+    try:
+        mod = import_module_from_path(export_file)
+    except Exception as e:  # pragma: no cover - best effort
+        print(f"Failed to import {export_file}: {e}", file=sys.stderr)
+        return None
+    show_splash = bool(getattr(mod, "__show_splash__", False))
+    raw_pages = getattr(mod, "__pages__", [])
+    if not isinstance(raw_pages, list):
+        return None
+    pages: list[Page] = []
+    for p in raw_pages:
+        if not p:
+            continue
+        page = coerce_page(p)
+        if page is not None:
+            pages.append(page)
+    return show_splash, pages
+
+
+@trace.traced()
+def load_pages(contents_root: Path) -> tuple[list[Page], bool]:
+    """Discover export.py modules under contents and collect their pages.
+
+    Returns (pages, any_show_splash_flag)
+    """
+    pages: list[Page] = []
+    show_splash_any = False
+    for show_splash, module_pages in iter_module_pages(contents_root):
+        show_splash_any = show_splash_any or show_splash
+        pages.extend(module_pages)
+    return pages, show_splash_any
+
+
+def load_module_page(contents_root: Path, kind: str) -> tuple[Optional[Page], str]:
+    """Locate a module's ``__<kind>__`` page ("card" or "recap").
+
+    A fresh bundle holds the page export.py declared when it was built;
+    otherwise export.py is imported (its markdown pages are only indexed, not
+    parsed). Either way the page is the one the module exports, so "missing"
+    means the same on both paths. Returns (page or None when missing, source
+    name).
+    """
+    export_path = contents_root / "export.py"
+    if not export_path.exists():
+        raise FileNotFoundError(f"export.py not found under {contents_root}")
+    bundle = load_bundle(contents_root)
+    if bundle is not None:
+        return getattr(bundle, kind), "bundle"
+    mod = import_module_from_path(export_path)
+    value = getattr(mod, f"__{kind}__", None)
+    if not value:
+        return None, "export.py"
+    page = coerce_page(value)
+    if page is None:
+        raise TypeError(f"__{kind}__ has unsupported type")
+    return page, "export.py"
+
+
+__all__ = [
+    "coerce_page",
+    "import_module_from_path",
+    "iter_module_pages",
+    "load_module_page",
+    "load_module_pages",
+    "load_pages",
+]
@@ -1,39 +1,176 @@
 from __future__ import annotations
+import re
+from functools import lru_cache
 from pathlib import Path
-from typing import List
+from typing import BinaryIO, Iterator, List, Optional, Tuple
+
+from . import trace
 
 SPLIT_TOKEN = "---"
 
+# Byte range [start, end) of one page's raw text within the file
+PageSpan = Tuple[int, int]
+
+# What str.strip() removes from a line besides line breaks, UTF-8 encoded
+_BLANK = rb"(?:[ \t\x0b\x0c\x1c-\x1f]|\xc2[\x85\xa0]|\xe1\x9a\x80|\xe2\x80[\x80-\x8a\xa8\xa9\xaf]|\xe2\x81\x9f|\xe3\x80\x80)"
+_END_OF_LINE = rb"(?=[\r\n]|\Z)"
+# A separator line, or the start of a line that opens a code fence (up to
+# three spaces of indent, then ``` or ~~~; group 1). Matches include the "\n"
+# before the line, which re searches for as a literal; the lookahead rejects
+# most other lines on their first byte.
+_CANDIDATE_RE = re.compile(
+    rb"\n(?=[-`~ \t\x0b\x0c\x1c-\x1f\xc2\xe1\xe2\xe3])(?:"
+    + _BLANK + rb"*" + re.escape(SPLIT_TOKEN.encode()) + _BLANK + rb"*" + _END_OF_LINE
+    + rb"| {0,3}(`{3,}|~{3,}))"
+)
+_BARE_CR_RE = re.compile(rb"\r(?!\n)")
+_CHUNK_SIZE = 1 << 16
+
+
+@lru_cache(maxsize=16)
+def _closing_fence_re(fence: bytes) -> "re.Pattern[bytes]":
+    """Lines closing ``fence``: at least as long, nothing else, at most three leading spaces."""
+    return re.compile(
+        rb"\n(?: {0,3}(?:[\t\x0b\x0c][ \t\x0b\x0c]*)?)"
+        + re.escape(fence) + re.escape(fence[:1]) + rb"*[ \t\x0b\x0c]*" + _END_OF_LINE
+    )
 
+
+def _scan_pages(f: BinaryIO, *, keep_text: bool) -> Iterator[Tuple[int, int, Optional[bytes]]]:
+    """Yield ``(start, end, raw)`` for every page of ``f``, reading it in chunks.
+
+    ``[start, end)`` is the page's byte span (the separator lines lie outside
+    it); ``raw`` holds those bytes when ``keep_text`` is set and is None
+    otherwise. Separators and fence openings are found with ``_CANDIDATE_RE``;
+    inside a fence only its closing line is searched for, so ``---`` there is
+    skipped without being looked at. At most one page is buffered.
+    """
+    fence: Optional[bytes] = None
+    page_start = 0
+    pending: List[bytes] = []
+    pos = 0
+    tail = b""
+    while True:
+        block = f.read(_CHUNK_SIZE)
+        buf = tail + block
+        if block:
+            # Scan complete lines only; the rest waits for the next chunk
+            cut = max(buf.rfind(b"\n"), buf.rfind(b"\r")) + 1
+            if not cut:
+                tail = buf
+                continue
+        else:
+            cut = len(buf)
+        data, tail = buf[:cut], buf[cut:]
+        # Searched copy: one "\n" in front and bare "\r" line ends turned into
+        # "\n", so every line follows a "\n"; data[i] is scan[i + 1]
+        scan = b"\n" + data
+        if b"\r" in data:
+            scan = _BARE_CR_RE.sub(b"\n", scan)
+        taken = 0
+        at = 0
+        while True:
+            if fence is not None:
+                m = _closing_fence_re(fence).search(scan, at)
+                if m is None:
+                    break
+                fence = None
+                at = m.end()
+                continue
+            m = _CANDIDATE_RE.search(scan, at)
+            if m is None:
+                break
+            at = m.end()
+            fence = m[1]
+            if fence is not None:
+                continue
+            start, end = m.start(), at - 1  # the separator line within data
+            raw: Optional[bytes] = None
+            if keep_text:
+                pending.append(data[taken:start])
+                raw = b"".join(pending)
+                pending = []
+            yield page_start, pos + start, raw
+            page_start = pos + end
+            taken = end
+        if keep_text:
+            pending.append(data[taken:])
+        pos += cut
+        if not block:
+            break
+    yield page_start, pos, b"".join(pending) if keep_text else None
+
+
+def _page_lines(raw: bytes) -> List[str]:
+    """Decode one page, split it into lines and strip leading/trailing blank lines."""
+    text = raw.decode("utf-8")
+    if "\r" in text:
+        text = text.replace("\r\n", "\n").replace("\r", "\n")
+    # Cut at the line breaks around the first and last non-blank characters
+    # instead of testing every line
+    content_end = len(text.rstrip())
+    if not content_end:
+        return []
+    start = text.rfind("\n", 0, len(text) - len(text.lstrip())) + 1
+    end = text.find("\n", content_end)
+    if end == -1:
+        end = len(text)
+    return text[start:end].split("\n")
+
+
+def iter_markdown_pages(md_path: Path) -> Iterator[List[str]]:
+    """Yield the pages of a markdown file as line lists while reading it.
+
+    Lines consisting of SPLIT_TOKEN separate pages unless they sit inside a
+    fenced code block. The splitter line itself is removed, and leading and
+    trailing blank lines of each page are stripped for cleaner centering.
+    Only the page being collected is held in memory.
+    """
+    with open(md_path, "rb") as f:
+        for _, _, raw in _scan_pages(f, keep_text=True):
+            yield _page_lines(raw or b"")
+
+
+@trace.traced()
 def load_markdown_pages(md_path: Path) -> List[list[str]]:
     """Load a markdown file and split into page line lists by SPLIT_TOKEN lines.
 
-    Blank lines are preserved. The splitter line itself is removed.
     Each returned page is a list of markup-ready strings (we allow Rich markup inside).
     """
-    text = md_path.read_text(encoding="utf-8")
-    # Normalize newlines
-    text = text.replace("\r\n", "\n").replace("\r", "\n")
-    raw_pages = []
-    current: list[str] = []
-    for raw_line in text.split("\n"):
-        if raw_line.strip() == SPLIT_TOKEN:
-            # Flush current page
-            raw_pages.append(current)
-            current = []
-            continue
-        current.append(raw_line)
-    raw_pages.append(current)  # last page
-
-    # Strip leading/trailing blank lines per page for cleaner centering
-    pages: List[list[str]] = []
-    for page in raw_pages:
-        # remove leading blanks
-        while page and page[0].strip() == "":
-            page.pop(0)
-        while page and page[-1].strip() == "":
-            page.pop()
-        pages.append(page)
-    return pages
-
-__all__ = ["load_markdown_pages", "SPLIT_TOKEN"]
+    return list(iter_markdown_pages(md_path))
+
+
+def iter_markdown_spans(md_path: Path) -> Iterator[PageSpan]:
+    """Yield the byte span of every page without keeping any page text."""
+    with open(md_path, "rb") as f:
+        for start, end, _ in _scan_pages(f, keep_text=False):
+            yield start, end
+
+
+def index_markdown_pages(md_path: Path) -> List[PageSpan]:
+    """Return the byte span of every page (see ``read_markdown_page``)."""
+    return list(iter_markdown_spans(md_path))
+
+
+def read_markdown_page(md_path: Path, span: PageSpan) -> List[str]:
+    """Read one page (as ``load_markdown_pages`` would return it) from its byte span."""
+    start, end = span
+    with open(md_path, "rb") as f:
+        f.seek(start)
+        return _page_lines(f.read(end - start))
+
+
+def count_markdown_pages(md_path: Path) -> int:
+    """Count the pages ``load_markdown_pages`` would return without building them."""
+    return len(index_markdown_pages(md_path))
+
+
+__all__ = [
+    "SPLIT_TOKEN",
+    "count_markdown_pages",
+    "index_markdown_pages",
+    "iter_markdown_spans",
+    "iter_markdown_pages",
+    "load_markdown_pages",
+    "read_markdown_page",
+]
@@ -0,0 +1,153 @@
+"""Index of a module's pages for jump navigation and full-text search.
+
+Built once per session from the page list (see ``_PageEngine``): every page
+gets a ``PageEntry`` (number, source file, headings) and its text, as shown
+to the reader, goes into an inverted index. Latin text is indexed by word;
+CJK text has no word boundaries, so runs of CJK characters are indexed as
+single characters plus overlapping bigrams. A query matches the pages that
+contain all of its terms; query words match any indexed word they prefix.
+"""
+
+from __future__ import annotations
+
+import re
+from bisect import bisect_left
+from typing import Dict, Iterable, List, Optional, Sequence
+
+from . import trace
+from .pages import LinesPage, MarkdownPage, Page
+
+# Kana, CJK ideographs (with extension A and compatibility forms) and Hangul
+_CJK = "\u3040-\u30ff\u3400-\u4dbf\u4e00-\u9fff\uf900-\ufaff\uac00-\ud7af"
+_TOKEN_RE = re.compile(f"[{_CJK}]+|[^\\W{_CJK}]+")
+_CJK_RE = re.compile(f"[{_CJK}]")
+_HEADING_RE = re.compile(r"^ {0,3}#{1,6}\s+(.*?)[ #]*$")
+
+
+class PageEntry:
+    """Where page ``number`` (0-based) came from and the headings it shows."""
+
+    __slots__ = ("number", "origin", "headings")
+
+    def __init__(self, number: int, origin: Optional[str], headings: Sequence[str]):
+        self.number = number
+        self.origin = origin
+        self.headings = tuple(headings)
+
+    @property
+    def title(self) -> str:
+        return self.headings[0] if self.headings else ""
+
+
+def _terms(text: str) -> List[str]:
+    """Index terms of ``text``: casefolded words, CJK characters and bigrams."""
+    terms: List[str] = []
+    for token in _TOKEN_RE.findall(text.casefold()):
+        if _CJK_RE.match(token):
+            terms.extend(token)
+            terms.extend(token[i : i + 2] for i in range(len(token) - 1))
+        else:
+            terms.append(token)
+    return terms
+
+
+def _markdown_headings(text: str) -> List[str]:
+    headings: List[str] = []
+    fence = ""
+    for line in text.split("\n"):
+        stripped = line.lstrip()
+        if stripped.startswith(("```", "~~~")):
+            if not fence:
+                fence = stripped[:3]
+            elif stripped.startswith(fence):
+                fence = ""
+            continue
+        if not fence:
+            m = _HEADING_RE.match(line)
+            if m and m.group(1):
+                headings.append(m.group(1))
+    return headings
+
+
+def _page_headings(page: Page, text: str) -> List[str]:
+    if isinstance(page, MarkdownPage):
+        return _markdown_headings(text)
+    if isinstance(page, LinesPage):
+        # Title screens: the first non-blank line
+        first = next((line.strip() for line in text.split("\n") if line.strip()), "")
+        return [first] if first else []
+    return []
+
+
+class PageIndex:
+    """Page entries plus an inverted index from term to sorted page numbers."""
+
+    def __init__(self, pages: Iterable[Page] = ()):
+        self.entries: List[PageEntry] = []
+        self._postings: Dict[str, List[int]] = {}
+        self._terms: List[str] = []
+        self.extend(pages)
+
+    def extend(self, pages: Iterable[Page]) -> None:
+        """Index ``pages`` as the pages following those already indexed."""
+        postings = self._postings
+        for number, page in enumerate(pages, start=len(self.entries)):
+            text_of = getattr(page, "text", None)
+            try:
+                text = text_of() if callable(text_of) else ""
+            except Exception:  # pragma: no cover - such a page fails to render as well
+                text = ""
+            origin = getattr(page, "origin", None)
+            self.entries.append(PageEntry(number, origin, _page_headings(page, text)))
+            for term in _terms(f"{origin or ''}\n{text}"):
+                numbers = postings.setdefault(term, [])
+                if not numbers or numbers[-1] != number:
+                    numbers.append(number)
+        self._terms = sorted(postings)
+
+    def __len__(self) -> int:
+        return len(self.entries)
+
+    def _lookup(self, term: str, prefix: bool) -> set:
+        if not prefix:
+            return set(self._postings.get(term, ()))
+        found: set = set()
+        i = bisect_left(self._terms, term)
+        while i < len(self._terms) and self._terms[i].startswith(term):
+            found.update(self._postings[self._terms[i]])
+            i += 1
+        return found
+
+    def search(self, query: str) -> List[int]:
+        """Numbers of the pages containing every term of ``query``, in order."""
+        result: Optional[set] = None
+        for token in _TOKEN_RE.findall(query.casefold()):
+            if _CJK_RE.match(token):
+                grams = [token] if len(token) == 1 else [token[i : i + 2] for i in range(len(token) - 1)]
+                sets = [self._lookup(gram, prefix=False) for gram in grams]
+            else:
+                sets = [self._lookup(token, prefix=True)]
+            for found in sets:
+                result = found if result is None else result & found
+            if not result:
+                return []
+        return sorted(result) if result else []
+
+    def next_match(self, query: str, current: int, step: int = 1) -> Optional[int]:
+        """The first match after (``step`` 1) or before (-1) ``current``, wrapping around."""
+        matches = self.search(query)
+        if not matches:
+            return None
+        if step > 0:
+            i = bisect_left(matches, current + 1)
+            return matches[i] if i < len(matches) else matches[0]
+        i = bisect_left(matches, current) - 1
+        return matches[i]
+
+
+@trace.traced("page_index.build")
+def build_page_index(pages: Iterable[Page]) -> PageIndex:
+    return PageIndex(pages)
+
+
+__all__ = ["PageEntry", "PageIndex", "build_page_index"]
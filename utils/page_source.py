@@ -0,0 +1,82 @@
+from __future__ import annotations
+
+import threading
+from typing import Iterable, Iterator, List, Sequence, Tuple, overload
+
+from .pages import Page
+
+# Each loaded module contributes (show_splash, pages)
+ModulePages = Tuple[bool, Sequence[Page]]
+
+
+class PageSource(Sequence[Page]):
+    """Sequence of pages filled in by a background loader thread.
+
+    ``modules`` is consumed on the loader thread. Page sources are not read
+    ahead (a ``LazyMarkdownPage`` reads its span when first rendered), so the
+    loader holds no more text than the pages themselves. Indexing blocks only
+    until the requested page exists, so the engine can draw page 0 while the
+    rest of the content is still loading.
+    """
+
+    def __init__(self, modules: Iterable[ModulePages]):
+        self._pages: List[Page] = []
+        self._show_splash: bool | None = None
+        self._done = False
+        self._error: BaseException | None = None
+        self._cond = threading.Condition()
+        self._thread = threading.Thread(
+            target=self._run, args=(iter(modules),), name="page-loader", daemon=True
+        )
+        self._thread.start()
+
+    def _run(self, modules: Iterator[ModulePages]) -> None:
+        try:
+            for show_splash, pages in modules:
+                with self._cond:
+                    if self._show_splash is None:
+                        self._show_splash = show_splash
+                    self._pages.extend(pages)
+                    self._cond.notify_all()
+        except BaseException as e:  # pragma: no cover - surfaced to the reader
+            self._error = e
+        finally:
+            with self._cond:
+                self._done = True
+                self._cond.notify_all()
+
+    def _wait(self, predicate) -> None:
+        with self._cond:
+            self._cond.wait_for(lambda: self._done or predicate())
+        if self._error is not None:
+            raise self._error
+
+    @property
+    def done(self) -> bool:
+        return self._done
+
+    @property
+    def show_splash(self) -> bool:
+        """Whether the first module asked for the splash screen (waits for that module only)."""
+        self._wait(lambda: self._show_splash is not None)
+        return bool(self._show_splash)
+
+    def __len__(self) -> int:
+        self._wait(lambda: False)
+        return len(self._pages)
+
+    @overload
+    def __getitem__(self, index: int) -> Page: ...
+
+    @overload
+    def __getitem__(self, index: slice) -> Sequence[Page]: ...
+
+    def __getitem__(self, index):
+        if isinstance(index, slice) or index < 0:
+            self._wait(lambda: False)
+            return self._pages[index]
+        self._wait(lambda: len(self._pages) > index)
+        return self._pages[index]
+
+
+__all__ = ["PageSource"]
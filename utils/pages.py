@@ -1,15 +1,26 @@
 from __future__ import annotations
 
+import re
+import threading
+from array import array
+from collections import OrderedDict
+from contextlib import contextmanager
+from functools import lru_cache
+from itertools import chain
 from pathlib import Path
-from typing import List, Sequence, Protocol
+from typing import Iterator, List, Optional, Sequence, Protocol
 
-from rich.syntax import Syntax
 from rich.panel import Panel
 from rich.text import Text
-from rich.console import Group, RenderableType
-from rich.markdown import Markdown
+from rich.console import Console, Group, RenderableType
 
-from .markdown_pages import load_markdown_pages
+# rich.markdown (markdown-it) and rich.syntax (Pygments) are comparatively
+# expensive to import; they are imported on first use so sessions that never
+# show a markdown page or code block do not pay for them.
+
+from . import trace
+from .markdown_pages import iter_markdown_spans, read_markdown_page
+from .template import Template, compile_template
 
 
 class Page(Protocol):
@@ -27,15 +38,27 @@ class Page(Protocol):
 class LinesPage:
     """Simple page that centers provided markup lines vertically and horizontally."""
 
+    __slots__ = ("_templates",)
+
     def __init__(self, lines: Sequence[str]):
-        self._lines = [str(line) for line in lines]
+        # Placeholders are located once; rendering only joins session values in.
+        # The (shared) templates are the only copy of the line text.
+        self._templates = tuple(compile_template(str(line)) for line in lines)
+
+    @property
+    def _lines(self) -> List[str]:
+        return [t.source for t in self._templates]
+
+    def text(self) -> str:
+        """Plain text of the page as shown (markup stripped), for search."""
+        return "\n".join(Text.from_markup(t.render()).plain for t in self._templates)
 
     def render(self, width: int, height: int) -> RenderableType:
         # Horizontal center by padding with spaces; vertical center by blank lines
         text = Text()
         inner_width = max(width, 1)
-        # Post-process tokens then build Text
-        processed_src_lines = [_replace_flag_tag(line) for line in self._lines]
+        # Substitute placeholders then build Text
+        processed_src_lines = [t.render() for t in self._templates]
         content_lines: List[Text] = [Text.from_markup(line) if line else Text("") for line in processed_src_lines]
 
         # compute vertical padding
@@ -59,53 +82,55 @@ class LinesPage:
         return text
 
 
+# Punctuation that gets a space inserted after it, when followed by a non-space
+_SPACED_PUNCT_RE = re.compile(r"[,.:;!?)\]}\uff0c\u3002](?=\S)")
+_URL_SCHEMES = ("http", "https", "ftp")
+
+
+def _is_scheme_char(ch: str) -> bool:
+    return ch.isalnum() or ch in "+-."
+
+
+def _ends_with_url_scheme(seg: str, i: int) -> bool:
+    """True if the maximal scheme-like run ending before ``seg[i]`` is a URL scheme.
+
+    Only the three known schemes can match, so this checks a bounded suffix
+    instead of scanning backwards over the whole run.
+    """
+    for scheme in _URL_SCHEMES:
+        start = i - len(scheme)
+        if start >= 0 and seg.startswith(scheme, start) and (start == 0 or not _is_scheme_char(seg[start - 1])):
+            return True
+    return False
+
+
+def _space_after_punctuation(seg: str) -> str:
+    """Insert a space after punctuation in plain (non-code) text. Linear time."""
+
+    def repl(m: re.Match) -> str:
+        i = m.start()
+        ch = seg[i]
+        nxt = seg[i + 1]
+        if ch == '!' and nxt == '[':  # image link
+            return ch
+        if ch == ']' and nxt == '(':  # link target
+            return ch
+        if ch == '.' and i > 0 and seg[i - 1].isalnum() and nxt.isalnum():  # 1.5, file.txt
+            return ch
+        if ch == ':' and nxt == '/' and _ends_with_url_scheme(seg, i):
+            return ch
+        return ch + ' '
+
+    return _SPACED_PUNCT_RE.sub(repl, seg)
+
+
+@lru_cache(maxsize=64)
 def _insert_space_after_punctuation(text: str) -> str:
-    # Mirrors the engine's previous behavior; safe around code/links/urls
-    def process_segment(seg: str) -> str:
-        if not seg:
-            return seg
-        out: list[str] = []
-        i = 0
-        L = len(seg)
-        while i < L:
-            ch = seg[i]
-            if ch == '!' and i + 1 < L and seg[i + 1] == '[':
-                out.append(ch)
-                i += 1
-                continue
-            if ch in ",.:;!?)]}\uff0c\u3002":
-                nxt = seg[i + 1] if i + 1 < L else ""
-                if ch == ']' and nxt == '(':
-                    out.append(ch)
-                    i += 1
-                    continue
-                if not nxt or nxt.isspace():
-                    out.append(ch)
-                    i += 1
-                    continue
-                prev = seg[i - 1] if i - 1 >= 0 else ""
-                if ch == '.':
-                    if prev.isalnum() and nxt.isalnum():
-                        out.append(ch)
-                        i += 1
-                        continue
-                if ch == ':':
-                    j = i - 1
-                    while j >= 0 and (seg[j].isalnum() or seg[j] in ['+', '-', '.']):
-                        j -= 1
-                    scheme = seg[j + 1:i]
-                    if scheme in ("http", "https", "ftp") and nxt == '/':
-                        out.append(ch)
-                        i += 1
-                        continue
-                out.append(ch)
-                out.append(' ')
-                i += 1
-                continue
-            out.append(ch)
-            i += 1
-        return "".join(out)
+    """Normalize spacing after punctuation, leaving fenced and inline code untouched.
 
+    Runs in linear time and is memoized per source text, so a page source is
+    only normalized once however often it is rendered.
+    """
     lines = text.replace("\r\n", "\n").replace("\r", "\n").split("\n")
     out_lines: list[str] = []
     in_fence = False
@@ -125,6 +150,9 @@ def _insert_space_after_punctuation(text: str) -> str:
         if in_fence:
             out_lines.append(line)
             continue
+        if '`' not in line:
+            out_lines.append(_space_after_punctuation(line))
+            continue
         # inline code
         i = 0
         L = len(line)
@@ -139,7 +167,7 @@ def _insert_space_after_punctuation(text: str) -> str:
                     i += 1
                 close = line.find('`' * n, i)
                 if close == -1:
-                    rebuilt.append(process_segment(line[start:]))
+                    rebuilt.append(_space_after_punctuation(line[start:]))
                     i = L
                     break
                 rebuilt.append(line[start:close + n])
@@ -147,34 +175,197 @@ def _insert_space_after_punctuation(text: str) -> str:
             else:
                 next_bt = line.find('`', i)
                 chunk = line[i:] if next_bt == -1 else line[i:next_bt]
-                rebuilt.append(process_segment(chunk))
+                rebuilt.append(_space_after_punctuation(chunk))
                 i = L if next_bt == -1 else next_bt
         out_lines.append("".join(rebuilt))
     return "\n".join(out_lines)
 
 
+# Highlighted code blocks keyed by (code, (lexer, theme), line_range); shared by
+# all pages because identical snippets recur across a module.
+_HIGHLIGHT_CACHE: "OrderedDict[tuple, Text]" = OrderedDict()
+_HIGHLIGHT_CACHE_SIZE = 256
+_HIGHLIGHT_LOCK = threading.Lock()
+
+# Distinct widths whose line layout a MarkdownPage keeps (terminal resizes
+# rarely visit more than a couple of sizes)
+_LAYOUTS_PER_PAGE = 4
+
+# Pages holding a parsed document and layouts; the least recently rendered
+# ones beyond this drop them (they are rebuilt from the source on demand)
+_LIVE_PAGES: "OrderedDict[object, None]" = OrderedDict()
+_LIVE_PAGES_SIZE = 16
+_LIVE_LOCK = threading.Lock()
+
+
+def _mark_live(page) -> None:
+    """Record ``page`` as recently rendered and release the render state of the oldest pages.
+
+    Must be called without holding ``page._lock``.
+    """
+    with _LIVE_LOCK:
+        _LIVE_PAGES[page] = None
+        _LIVE_PAGES.move_to_end(page)
+        evicted = []
+        while len(_LIVE_PAGES) > _LIVE_PAGES_SIZE:
+            evicted.append(_LIVE_PAGES.popitem(last=False)[0])
+    for old in evicted:
+        old._release()
+
+# Idle consoles for ``render_lines``. The engine starts a new thread for every
+# foreground render, so consoles are pooled rather than kept per thread. At most
+# ``_OFFSCREEN_POOL_SIZE`` are kept (the prefetcher plus a few foreground
+# renders); consoles freed by a burst of cancelled renders are dropped.
+_OFFSCREEN_POOL_SIZE = 4
+_OFFSCREEN_CONSOLES: List[Console] = []
+_OFFSCREEN_LOCK = threading.Lock()
+
+
+@contextmanager
+def _offscreen_console() -> Iterator[Console]:
+    """Borrow a Console used only for ``render_lines``; reused across renders and threads."""
+    with _OFFSCREEN_LOCK:
+        console = _OFFSCREEN_CONSOLES.pop() if _OFFSCREEN_CONSOLES else None
+    if console is None:
+        console = Console(width=80)
+    try:
+        yield console
+    finally:
+        with _OFFSCREEN_LOCK:
+            if len(_OFFSCREEN_CONSOLES) < _OFFSCREEN_POOL_SIZE:
+                _OFFSCREEN_CONSOLES.append(console)
+
+
+@lru_cache(maxsize=1)
+def _markdown_class():
+    """Build (once) the Markdown subclass whose code blocks reuse highlighting."""
+    from rich.markdown import CodeBlock, Markdown
+    from rich.syntax import Syntax
+
+    class _CachedSyntax(Syntax):
+        def __init__(self, code, lexer, *, theme, **kwargs):
+            super().__init__(code, lexer, theme=theme, **kwargs)
+            self._cache_id = (lexer, theme)
+
+        def highlight(self, code, line_range=None):
+            key = (code, self._cache_id, line_range)
+            with _HIGHLIGHT_LOCK:
+                text = _HIGHLIGHT_CACHE.get(key)
+                if text is not None:
+                    _HIGHLIGHT_CACHE.move_to_end(key)
+                    return text.copy()
+            text = super().highlight(code, line_range)
+            with _HIGHLIGHT_LOCK:
+                _HIGHLIGHT_CACHE[key] = text.copy()
+                while len(_HIGHLIGHT_CACHE) > _HIGHLIGHT_CACHE_SIZE:
+                    _HIGHLIGHT_CACHE.popitem(last=False)
+            return text
+
+    class _CachedCodeBlock(CodeBlock):
+        def __rich_console__(self, console, options):
+            code = str(self.text).rstrip()
+            yield _CachedSyntax(code, self.lexer_name, theme=self.theme, word_wrap=True, padding=1)
+
+    class _PageMarkdown(Markdown):
+        elements = {**Markdown.elements, "fence": _CachedCodeBlock, "code_block": _CachedCodeBlock}
+
+        def __init__(self, markup, **kwargs):
+            super().__init__(markup, **kwargs)
+            # Rendering only walks the parsed tokens; do not keep a second copy of the text
+            self.markup = ""
+
+    return _PageMarkdown
+
+
 class MarkdownPage:
-    """Markdown-driven page. Handles its own layout within the given area."""
+    """Markdown-driven page. Handles its own layout within the given area.
+
+    Rendering is split in two stages: the width-independent one (token
+    replacement, spacing normalization and the markdown-it parse) runs once
+    per page and is kept; the line layout for a given width is memoized for
+    the last few widths, so re-rendering at a new height or a previously seen
+    width costs only vertical centering. Only the ``_LIVE_PAGES_SIZE`` most
+    recently rendered pages keep that state.
+    """
 
-    def __init__(self, source: str):
-        self._src = source.rstrip("\n")
+    __slots__ = ("_src", "_normalized", "_template_cache", "_markdown", "_layouts", "_lock", "origin")
 
-    def render(self, width: int, height: int) -> RenderableType:
-        # Apply token replacement first, then spacing normalization
-        src = _replace_flag_tag(self._src)
-        src = _insert_space_after_punctuation(src)
-        md = Markdown(src, code_theme="monokai", hyperlinks=True, justify="left")
-        # Render to lines, then apply vertical centering to mimic previous behavior
-        from rich.console import Console
-        console = Console(width=width, record=True)
-        seg_lines = console.render_lines(md, console.options.update(width=max(width, 1)))
+    def __init__(self, source: str, *, normalized: bool = False, origin: Optional[str] = None):
+        self._src = source.rstrip("\n")
+        # True when the source already went through token replacement and
+        # spacing normalization (e.g. loaded from a precompiled bundle)
+        self._normalized = normalized
+        # Name of the file the page was split from, when known
+        self.origin = origin
+        self._template_cache: Optional[Template] = None if normalized else Template(self._src)
+        self._init_render_state()
+
+    def _init_render_state(self) -> None:
+        self._markdown = None
+        self._layouts: "Optional[OrderedDict[int, List[Text]]]" = None
+        self._lock = threading.Lock()
+
+    def _release(self) -> None:
+        """Drop the parsed document and layouts (see ``_mark_live``)."""
+        with self._lock:
+            self._markdown = None
+            self._layouts = None
+
+    @property
+    def _template(self) -> Template:
+        if self._template_cache is None:
+            self._template_cache = Template(self._src)
+        return self._template_cache
+
+    def _source_text(self) -> str:
+        return self._src
+
+    def text(self) -> str:
+        """The source as rendered (placeholders substituted, spacing normalized); not kept."""
+        src = self._source_text()
+        if self._normalized:
+            return src
+        template = self._template_cache or Template(src)
+        return _insert_space_after_punctuation(template.render())
+
+    def _parsed(self):
+        if self._markdown is None:
+            src = self._src
+            with trace.span("markdown.parse"):
+                if not self._normalized:
+                    # Apply token replacement first, then spacing normalization
+                    src = self._template.render()
+                    src = _insert_space_after_punctuation(src)
+                self._markdown = _markdown_class()(src, code_theme="monokai", hyperlinks=True, justify="left")
+        return self._markdown
+
+    def _layout(self, width: int) -> List[Text]:
+        if self._layouts is None:
+            self._layouts = OrderedDict()
+        lines = self._layouts.get(width)
+        if lines is not None:
+            self._layouts.move_to_end(width)
+            return lines
+        markdown = self._parsed()
+        with trace.span("markdown.layout", width=width), _offscreen_console() as console:
+            seg_lines = console.render_lines(markdown, console.options.update(width=max(width, 1)))
         # Stitch lines back into Text
-        out_lines: List[Text] = []
+        lines = []
         for segs in seg_lines:
             t = Text()
             for seg in segs:
                 t.append(seg.text, seg.style)
-            out_lines.append(t)
+            lines.append(t)
+        self._layouts[width] = lines
+        while len(self._layouts) > _LAYOUTS_PER_PAGE:
+            self._layouts.popitem(last=False)
+        return lines
+
+    def render(self, width: int, height: int) -> RenderableType:
+        with self._lock:
+            out_lines = self._layout(width)
+        _mark_live(self)
+        # Apply vertical centering to mimic previous behavior
         content_h = len(out_lines)
         avail = max(height, 0)
         if content_h < avail:
@@ -184,29 +375,151 @@ class MarkdownPage:
         return Group(*out_lines)
 
 
+class MarkdownFile:
+    """A markdown file whose pages are read from disk one at a time.
+
+    Construction streams the file once to record the byte span of every page;
+    ``LazyMarkdownPage`` entries refer to this object plus a page index and
+    read just their own span when first needed.
+    """
+
+    __slots__ = ("path", "_offsets")
+
+    def __init__(self, path: Path):
+        self.path = path
+        # Flat (start, end) pairs; far smaller than a list of tuples for big files
+        with trace.span("markdown.index", path=str(path)):
+            self._offsets = array("Q", chain.from_iterable(iter_markdown_spans(path)))
+
+    def __len__(self) -> int:
+        return len(self._offsets) // 2
+
+    def page_source(self, index: int) -> str:
+        span = (self._offsets[2 * index], self._offsets[2 * index + 1])
+        return "\n".join(read_markdown_page(self.path, span))
+
+
+class LazyMarkdownPage(MarkdownPage):
+    """``MarkdownPage`` whose source is loaded from a ``MarkdownFile`` on first use.
+
+    The page keeps only its file and index: once parsed, the source text is
+    dropped and re-read from its byte span if the page is parsed again.
+    """
+
+    __slots__ = ("_file", "_index", "_loaded")
+
+    def __init__(self, md_file: MarkdownFile, index: int):
+        self._file = md_file
+        self._index = index
+        self._normalized = False
+        self._loaded: Optional[str] = None
+        self._template_cache = None
+        self._init_render_state()
+
+    @property
+    def _src(self) -> str:  # type: ignore[override]
+        if self._loaded is None:
+            self._loaded = self._file.page_source(self._index).rstrip("\n")
+        return self._loaded
+
+    @property
+    def origin(self) -> str:  # type: ignore[override]
+        return self._file.path.name
+
+    def _source_text(self) -> str:
+        # Read the span again rather than keeping the text of every page indexed
+        loaded = self._loaded
+        return loaded if loaded is not None else self._file.page_source(self._index).rstrip("\n")
+
+    def _parsed(self):
+        markdown = super()._parsed()
+        self._loaded = None
+        self._template_cache = None
+        return markdown
+
+    def load(self) -> None:
+        """Materialize the page source and its placeholder split.
+
+        The text is kept until the page is parsed; ``utils.server`` does this
+        before forking so sessions share it instead of each reading it.
+        """
+        self._template
+
+
 class CompositePage:
+    """Stack of arbitrary renderables, optionally centered vertically.
+
+    The blocks are laid out once per ``(width, height)``: the measured segment
+    lines are kept and returned directly (with their padding), so the outer
+    console does not render the group a second time and Pygments-highlighted
+    ``syntax_block``s are not highlighted twice per frame.
+    """
+
+    __slots__ = ("_blocks", "_center", "_layouts", "_lock")
+
     def __init__(self, *blocks: RenderableType, center_vertically: bool = True):
-        self._blocks = list(blocks)
+        self._blocks = tuple(blocks)
         self._center = center_vertically
+        self._layouts: "Optional[OrderedDict[tuple[int, int], RenderableType]]" = None
+        self._lock = threading.Lock()
+
+    def _release(self) -> None:
+        with self._lock:
+            self._layouts = None
 
     def render(self, width: int, height: int) -> RenderableType:
-        # We rely on the outer Console sizing for width wrapping; just Group blocks
-        group = Group(*self._blocks)
-        if not self._center:
-            return group
-        # Vertically center by measuring rendered lines
-        from rich.console import Console
-        console = Console(width=width, record=True)
-        lines = console.render_lines(group, console.options.update(width=max(width, 1)))
+        key = (width, height)
+        with self._lock:
+            if self._layouts is None:
+                self._layouts = OrderedDict()
+            layout = self._layouts.get(key)
+            if layout is None:
+                layout = self._measure(width, height)
+                self._layouts[key] = layout
+                while len(self._layouts) > _LAYOUTS_PER_PAGE:
+                    self._layouts.popitem(last=False)
+            else:
+                self._layouts.move_to_end(key)
+        _mark_live(self)
+        return layout
+
+    def text(self) -> str:
+        """Plain text of the text and code blocks, for search."""
+        return "\n".join(filter(None, (_plain_text(block) for block in self._blocks)))
+
+    def _measure(self, width: int, height: int) -> RenderableType:
+        from rich.segment import SegmentLines
+
+        with _offscreen_console() as console:
+            lines = console.render_lines(Group(*self._blocks), console.options.update(width=max(width, 1)))
+        body = SegmentLines(lines, new_lines=True)
         content_h = len(lines)
         avail = max(height, 0)
-        if content_h >= avail:
-            return group
+        if not self._center or content_h >= avail:
+            return body
+        # Vertically center using the measured height
         top = (avail - content_h) // 2
         bottom = avail - content_h - top
         blanks_top = [Text("") for _ in range(top)]
         blanks_bottom = [Text("") for _ in range(bottom)]
-        return Group(*blanks_top, group, *blanks_bottom)
+        return Group(*blanks_top, body, *blanks_bottom)
+
+
+def _plain_text(renderable: RenderableType) -> str:
+    if isinstance(renderable, str):
+        return Text.from_markup(renderable).plain
+    if isinstance(renderable, Text):
+        return renderable.plain
+    code = getattr(renderable, "code", None)  # Syntax
+    if isinstance(code, str):
+        return code
+    inner = getattr(renderable, "renderable", None)  # Panel, Padding, Align
+    if inner is not None:
+        return _plain_text(inner)
+    children = getattr(renderable, "renderables", None)  # Group
+    if children is not None:
+        return "\n".join(filter(None, (_plain_text(child) for child in children)))
+    return ""
 
 
 def lines_page(lines: Sequence[str], *, padding: int | None = None, title: str | None = None) -> Page:
@@ -220,11 +533,13 @@ def markdown_page(markdown: str, *, padding: int | None = None, title: str | Non
 
 
 def markdown_file(path: Path, *, padding: int | None = None, title: str | None = None) -> List[Page]:
-    # padding/title ignored
-    return [MarkdownPage("\n".join(lines)) for lines in load_markdown_pages(path)]
+    # padding/title ignored; each page reads its own part of the file on first access
+    md_file = MarkdownFile(path)
+    return [LazyMarkdownPage(md_file, index) for index in range(len(md_file))]
 
 
 def syntax_block(code: str, language: str = "bash") -> RenderableType:
+    from rich.syntax import Syntax
     return Syntax(code, language, theme="monokai", word_wrap=True)
 
 
@@ -247,34 +562,7 @@ __all__ = [
     "composite_page",
     "LinesPage",
     "MarkdownPage",
+    "MarkdownFile",
+    "LazyMarkdownPage",
     "CompositePage",
 ]
-
-_FLAG_VALUE: str | None = None
-
-
-def _read_flag_value() -> str | None:
-    global _FLAG_VALUE
-    if _FLAG_VALUE is not None:
-        return _FLAG_VALUE
-    try:
-        flag_path = Path("/flag")
-        if flag_path.exists():
-            # Read and strip; keep single-line typical flag formats intact
-            value = flag_path.read_text(encoding="utf-8").strip()
-            _FLAG_VALUE = value
-            return value
-    except Exception as e:
-        # Raise instead for debugging
-        raise e
-    _FLAG_VALUE = None
-    return None
-
-
-def _replace_flag_tag(text: str) -> str:
-    if "[flag]" not in text:
-        return text
-    val = _read_flag_value()
-    if not val:
-        return text
-    return text.replace("[flag]", val)
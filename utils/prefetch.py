@@ -0,0 +1,97 @@
+from __future__ import annotations
+
+import threading
+from typing import Callable, Optional, Sequence
+
+from .frames import EncodedFrame, FrameCache, FrameKey
+from .pages import Page
+
+RenderFn = Callable[[Page, int, int], EncodedFrame]
+
+
+class Prefetcher:
+    """Render neighbouring pages into a ``FrameCache`` on a background thread.
+
+    The engine calls ``schedule`` after drawing a page; the worker then renders
+    the requested pages at the given terminal size while the reader is idle.
+    ``invalidate`` bumps a generation counter so that work started before a
+    resize is thrown away instead of landing in the cache, and a ``schedule``
+    that no longer asks for the page being rendered drops that result too.
+    """
+
+    def __init__(self, cache: FrameCache, render: RenderFn):
+        self._cache = cache
+        self._render = render
+        self._cond = threading.Condition()
+        self._queue: list[tuple[Page, int, int]] = []
+        self._generation = 0
+        self._inflight: Optional[FrameKey] = None
+        self._discard_inflight = False
+        self._closed = False
+        self._thread = threading.Thread(target=self._run, name="page-prefetch", daemon=True)
+        self._thread.start()
+
+    def schedule(self, pages: Sequence[Page], width: int, height: int) -> None:
+        """Replace pending work with ``pages`` rendered at ``width`` x ``height``.
+
+        A render in progress for a page that is not requested again (e.g. one
+        skipped over while the user held an arrow key) is discarded.
+        """
+        with self._cond:
+            self._queue = [
+                (page, width, height)
+                for page in pages
+                if (page, width, height) not in self._cache
+            ]
+            if self._inflight is not None and self._inflight not in self._queue:
+                self._discard_inflight = True
+            else:
+                # Wanted again (possibly after an earlier schedule gave it up): keep the result
+                self._discard_inflight = False
+                self._queue = [key for key in self._queue if key != self._inflight]
+            self._cond.notify()
+
+    def invalidate(self) -> None:
+        """Drop pending work and discard the result of any render in progress."""
+        with self._cond:
+            self._generation += 1
+            self._queue = []
+            self._cond.notify_all()
+
+    def wait_for(self, key: FrameKey, timeout: Optional[float] = None) -> Optional[EncodedFrame]:
+        """Return the cached frame for ``key``, waiting if the worker is rendering it."""
+        with self._cond:
+            self._cond.wait_for(lambda: self._inflight != key, timeout)
+        return self._cache.get(key)
+
+    def close(self) -> None:
+        with self._cond:
+            self._closed = True
+            self._queue = []
+            self._cond.notify_all()
+        self._thread.join(timeout=1.0)
+
+    def _run(self) -> None:
+        while True:
+            with self._cond:
+                self._cond.wait_for(lambda: self._closed or bool(self._queue))
+                if self._closed:
+                    return
+                page, width, height = self._queue.pop(0)
+                key = (page, width, height)
+                generation = self._generation
+                self._inflight = key
+                self._discard_inflight = False
+            try:
+                frame: Optional[EncodedFrame] = self._render(page, width, height)
+            except Exception:  # pragma: no cover - errors surface on the foreground render
+                frame = None
+            with self._cond:
+                keep = generation == self._generation and not self._discard_inflight
+                if frame is not None and keep:
+                    self._cache.put(key, frame)
+                self._inflight = None
+                self._cond.notify_all()
+
+
+__all__ = ["Prefetcher"]
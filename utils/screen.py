@@ -0,0 +1,212 @@
+from __future__ import annotations
+
+import os
+from array import array
+from typing import IO, Optional, Union
+
+from . import trace
+
+
+class EncodedFrame:
+    """A frame encoded once (UTF-8) with the offsets of its rows.
+
+    Cached frames are kept in this form so presenting one again neither
+    re-encodes the text nor searches it for row breaks; ``rows`` slices the
+    stored bytes without copying them.
+    """
+
+    __slots__ = ("data", "_ends")
+
+    def __init__(self, text: str):
+        self.data = text.encode("utf-8")
+        ends = array("I")
+        pos = self.data.find(b"\n")
+        while pos != -1:
+            ends.append(pos)
+            pos = self.data.find(b"\n", pos + 1)
+        if len(self.data) > (ends[-1] + 1 if ends else 0):
+            ends.append(len(self.data))  # last row without a newline
+        self._ends = ends
+
+    def __len__(self) -> int:
+        return len(self.data)
+
+    @property
+    def row_count(self) -> int:
+        return len(self._ends)
+
+    def rows(self) -> list[memoryview]:
+        view = memoryview(self.data)
+        out = []
+        start = 0
+        for end in self._ends:
+            out.append(view[start:end])
+            start = end + 1
+        return out
+
+
+Frame = Union[str, bytes, memoryview, EncodedFrame]
+Row = Union[bytes, memoryview]
+
+# DEC mode 2026: terminals that support it hold output until the end marker so
+# a repaint never shows half-drawn; others ignore the sequences.
+SYNC_BEGIN = b"\x1b[?2026h"
+SYNC_END = b"\x1b[?2026l"
+CLEAR_SCREEN = b"\x1b[H\x1b[2J"
+RESET_AND_CLEAR_EOL = b"\x1b[0m\x1b[K"
+CLEAR_LINE = b"\x1b[2K"
+AUTOWRAP_OFF = b"\x1b[?7l"
+AUTOWRAP_ON = b"\x1b[?7h"
+
+
+def _move_to_row(row: int) -> bytes:
+    return b"\x1b[%d;1H" % row
+
+
+class Screen:
+    """In-process compositor that repaints only the rows that changed.
+
+    The previously presented frame is kept; ``present`` compares it line by
+    line with the new one and emits cursor moves plus the changed rows as one
+    write wrapped in synchronized-update sequences. The first frame (and the
+    first one after ``invalidate``, e.g. on resize) is a full clear-and-paint.
+    ``status`` writes a line on the row below the frame (the input row); the
+    next ``present`` clears it.
+    """
+
+    def __init__(self, file: IO[str]):
+        self._file = file
+        self._prev: Optional[Frame] = None
+        self._prev_lines: Optional[list[Row]] = None
+        self._status_shown = False
+        try:
+            self._fd: Optional[int] = file.fileno()
+        except (AttributeError, OSError, ValueError):
+            self._fd = None
+
+    def invalidate(self) -> None:
+        """Forget the previous frame; the next ``present`` repaints everything."""
+        self._prev = None
+        self._prev_lines = None
+        self._status_shown = False
+
+    def present(self, frame: Frame, rows: Optional[int] = None) -> int:
+        """Draw ``frame`` (ANSI text, one terminal row per line); return bytes written.
+
+        ``rows`` is the terminal height; frames that do not fit scroll the
+        terminal, so they (and the frame after them) are painted in full.
+        """
+        if isinstance(frame, str):
+            frame = frame.encode("utf-8")
+        if self._prev is not None and rows is not None:
+            new_rows = frame.row_count if isinstance(frame, EncodedFrame) else len(_split_rows(frame))
+            if len(self._lines_of_prev()) >= rows or new_rows >= rows:
+                self.invalidate()
+        if self._prev is None:
+            # A cached or stored frame goes to writev untouched
+            data = frame.data if isinstance(frame, EncodedFrame) else frame
+            chunks: list[Union[bytes, memoryview]] = [SYNC_BEGIN + CLEAR_SCREEN, data, SYNC_END]
+            self._prev_lines = None
+        else:
+            prev_lines = self._lines_of_prev()
+            new_lines = _split_rows(frame)
+            self._prev_lines = new_lines
+            out = [SYNC_BEGIN]
+            if self._status_shown:
+                out.append(_move_to_row(len(prev_lines) + 1) + CLEAR_LINE)
+                self._status_shown = False
+            for row, line in enumerate(new_lines, start=1):
+                if row <= len(prev_lines) and prev_lines[row - 1] == line:
+                    continue
+                out.append(_move_to_row(row) + line + RESET_AND_CLEAR_EOL)
+            for row in range(len(new_lines) + 1, len(prev_lines) + 1):
+                out.append(_move_to_row(row) + CLEAR_LINE)
+            # Park the cursor below the frame, where a full paint leaves it
+            out.append(_move_to_row(len(new_lines) + 1))
+            out.append(SYNC_END)
+            chunks = [b"".join(out)]
+        self._prev = frame
+        return self._write(chunks)
+
+    def status(self, text: str) -> int:
+        """Show ``text`` (plain, one row) below the current frame; return bytes written.
+
+        The cursor is left after the text. An empty ``text`` clears the row.
+        """
+        if self._prev is None:
+            return 0
+        row = len(self._lines_of_prev()) + 1
+        self._status_shown = bool(text)
+        return self._write([SYNC_BEGIN + _move_to_row(row) + CLEAR_LINE + text.encode("utf-8") + SYNC_END])
+
+    def present_clipped(self, rows: int) -> int:
+        """Cheaply repaint the last frame for a terminal that is being resized.
+
+        The frame is clipped (or padded with blank rows) to ``rows`` and drawn
+        with autowrap disabled so the terminal clips over-long rows instead of
+        wrapping them. No rendering happens; the next ``present`` is a full
+        paint. Returns bytes written (0 when nothing was shown yet).
+        """
+        if self._prev is None:
+            return 0
+        lines = self._lines_of_prev()[: max(rows - 1, 0)]
+        out = [SYNC_BEGIN, AUTOWRAP_OFF, CLEAR_SCREEN]
+        for row, line in enumerate(lines, start=1):
+            out.append(_move_to_row(row) + line + RESET_AND_CLEAR_EOL)
+        out.extend([_move_to_row(len(lines) + 1), AUTOWRAP_ON, SYNC_END])
+        written = self._write([b"".join(out)])
+        self.invalidate()
+        return written
+
+    def _lines_of_prev(self) -> list[Row]:
+        if self._prev_lines is None:
+            assert self._prev is not None
+            self._prev_lines = _split_rows(self._prev)
+        return self._prev_lines
+
+    def _write(self, chunks: list[Union[bytes, memoryview]]) -> int:
+        total = sum(len(c) for c in chunks)
+        if self._fd is None:
+            self._file.write(b"".join(chunks).decode("utf-8", errors="replace"))
+            self._file.flush()
+            if trace.ENABLED:
+                trace.counter("frame", bytes=total, writes=1)
+            return total
+        self._file.flush()
+        pending = total
+        writes = 0
+        with trace.span("screen.write", bytes=total):
+            while pending:
+                written = os.writev(self._fd, chunks)
+                writes += 1
+                pending -= written
+                if pending:
+                    chunks = _advance(chunks, written)
+        if trace.ENABLED:
+            trace.counter("frame", bytes=total, writes=writes)
+        return total
+
+
+def _split_rows(frame: Frame) -> list[Row]:
+    if isinstance(frame, EncodedFrame):
+        return frame.rows()  # type: ignore[return-value]
+    data = frame if isinstance(frame, bytes) else bytes(frame)  # type: ignore[arg-type]
+    lines = data.split(b"\n")
+    if lines and lines[-1] == b"":
+        lines.pop()
+    return lines
+
+
+def _advance(chunks: list[Union[bytes, memoryview]], written: int) -> list[Union[bytes, memoryview]]:
+    """Drop ``written`` bytes from the front of ``chunks`` after a partial writev."""
+    out: list[Union[bytes, memoryview]] = []
+    for c in chunks:
+        if written >= len(c):
+            written -= len(c)
+            continue
+        out.append(memoryview(c)[written:] if written else c)
+        written = 0
+    return out
+
+
+__all__ = ["EncodedFrame", "Screen", "SYNC_BEGIN", "SYNC_END"]
@@ -0,0 +1,308 @@
+"""Pre-forking session server.
+
+Starting a session from scratch means a fresh interpreter importing Rich,
+markdown-it and Pygments and loading the module's pages before the first
+frame. The server does that once per host: it imports the engine, loads and
+parses every module under ``contents/``, freezes the GC (so the preloaded
+objects stay shared with children through copy-on-write) and then forks one
+child per session::
+
+    python -m utils.server --socket /run/shell-dojo.sock
+
+Sessions are started by the thin client (``python -m utils.client``), which
+passes its stdin/stdout/stderr over the Unix socket (``SCM_RIGHTS``) along
+with the challenge id, argv and terminal-related environment. The child
+attaches to those descriptors, runs ``main.run_session`` and reports its exit
+code back. The client forwards SIGWINCH and SIGINT as ``signal N`` lines,
+which the child re-raises in itself. The request is read in the child, so a
+client that connects and sends nothing never holds up other sessions.
+
+When the server runs as root, each child switches to the connecting user's
+uid/gid (from ``SO_PEERCRED``) before running the session. The challenge is
+the one configured for the connecting process (its ``/challenge/.config``,
+seen through ``/proc/<pid>/root``), not whatever the request claims. Only
+host-wide values such as ``[host]`` are resolved before the fork; ``[flag]``
+and the other per-session values are read by the child after it has dropped
+to the user's uid, with that user's permissions.
+
+The socket is created with mode 0660; pass ``--group`` to let the members of
+a group (the students) connect.
+"""
+
+from __future__ import annotations
+
+import json
+import os
+import signal
+import socket
+import struct
+import sys
+import threading
+from pathlib import Path
+from typing import Any, Dict, Optional, Sequence, Tuple
+
+from . import trace
+from .template import CHALLENGE_CONFIG, read_challenge_id
+
+DEFAULT_SOCKET = os.environ.get("SHELL_DOJO_SOCKET", "/run/shell-dojo.sock")
+# Forwarded from the client and replaced in the child's environment
+SESSION_ENV = ("TERM", "COLORTERM", "LANG", "LC_ALL", "LC_CTYPE", "NO_COLOR", "USER", "LOGNAME", "HOME")
+# Placeholders with the same value for every session on the host; pages that
+# use only these may be parsed (and their values resolved) before forking.
+# Never add per-user values (e.g. ``flag``): the server may run as root.
+HOST_WIDE_PLACEHOLDERS = frozenset({"host"})
+SOCKET_MODE = 0o660
+MAX_REQUEST = 64 * 1024
+# Seconds a forked child waits for the client's request before giving up
+HANDSHAKE_TIMEOUT = 5.0
+
+Preloaded = Dict[str, Tuple[Sequence[Any], bool]]
+
+
+def preload(contents_root: Path) -> Preloaded:
+    """Import the engine and load and parse every module under ``contents_root``."""
+    import main
+    from .pages import MarkdownPage, _markdown_class
+    from .template import session_value
+
+    _markdown_class()
+    import asyncio  # noqa: F401  (used by every session)
+    import rich.syntax  # noqa: F401
+
+    for name in HOST_WIDE_PLACEHOLDERS:
+        session_value(name)
+    modules: Preloaded = {}
+    for export_file in sorted(contents_root.glob("*/export.py")):
+        pages, show_splash = main.load_pages(export_file.parent)
+        for page in pages:
+            load = getattr(page, "load", None)
+            if callable(load):
+                load()
+            if isinstance(page, MarkdownPage) and (
+                page._normalized or page._template.names <= HOST_WIDE_PLACEHOLDERS
+            ):
+                page._parsed()
+        modules[export_file.parent.name] = (pages, show_splash)
+    return modules
+
+
+def _peer_credentials(conn: socket.socket) -> Tuple[int, int, int]:
+    creds = conn.getsockopt(socket.SOL_SOCKET, socket.SO_PEERCRED, struct.calcsize("3i"))
+    return struct.unpack("3i", creds)  # pid, uid, gid
+
+
+def _forward_signals(conn: socket.socket) -> None:
+    """Re-raise ``signal N`` lines from the client; a closed client hangs up the session."""
+    buf = b""
+    while True:
+        try:
+            data = conn.recv(4096)
+        except OSError:
+            data = b""
+        if not data:
+            signal.raise_signal(signal.SIGHUP)
+            return
+        buf += data
+        while b"\n" in buf:
+            line, buf = buf.split(b"\n", 1)
+            kind, _, value = line.partition(b" ")
+            if kind == b"signal" and value.isdigit():
+                signal.raise_signal(int(value))
+
+
+def _run_child(
+    conn: socket.socket,
+    fds: Sequence[int],
+    request: Dict[str, Any],
+    credentials: Tuple[int, int],
+    preloaded: Tuple[Sequence[Any], bool],
+) -> int:
+    """Attach to the client's terminal and run one session; return its exit code."""
+    import main
+
+    os.setsid()
+    # Behave like a fresh interpreter even if the server was started with
+    # signals ignored (e.g. under nohup or as a background job)
+    signal.signal(signal.SIGINT, signal.default_int_handler)
+    for sig in (signal.SIGCHLD, signal.SIGTERM, signal.SIGHUP, signal.SIGWINCH):
+        signal.signal(sig, signal.SIG_DFL)
+    for target, fd in enumerate(fds[:3]):
+        os.dup2(fd, target)
+    for fd in fds:
+        if fd > 2:
+            os.close(fd)
+    sys.stdin = open(0, "r", encoding="utf-8", closefd=False)
+    sys.stdout = open(1, "w", encoding="utf-8", buffering=1, closefd=False)
+    sys.stderr = open(2, "w", encoding="utf-8", buffering=1, closefd=False)
+
+    uid, gid = credentials
+    if os.geteuid() == 0 and uid != 0:
+        os.setgroups([])
+        os.setgid(gid)
+        os.setuid(uid)
+    env = request.get("env", {})
+    for key in SESSION_ENV:
+        if key in env:
+            os.environ[key] = str(env[key])
+        else:
+            os.environ.pop(key, None)
+    try:
+        os.chdir(request.get("cwd") or "/")
+    except OSError:
+        pass
+
+    threading.Thread(target=_forward_signals, args=(conn,), name="signal-forward", daemon=True).start()
+    argv = [str(a) for a in request.get("argv", [])]
+    try:
+        main.run_session(str(request["challenge"]), argv, preloaded=preloaded)
+    except SystemExit as e:
+        return e.code if isinstance(e.code, int) else 1
+    except KeyboardInterrupt:
+        return 130
+    return 0
+
+
+def _peer_challenge(pid: int) -> str:
+    """The challenge configured for process ``pid`` (in its own root, e.g. its container)."""
+    return read_challenge_id(f"/proc/{pid}/root{CHALLENGE_CONFIG}")
+
+
+def _read_request(
+    conn: socket.socket, modules: Preloaded, peer_pid: int
+) -> Tuple[list[int], Dict[str, Any], Tuple[Sequence[Any], bool]]:
+    """Receive and check the client's request and descriptors (runs in the child)."""
+    fds: list[int] = []
+    try:
+        conn.settimeout(HANDSHAKE_TIMEOUT)
+        msg, fds, _, _ = socket.recv_fds(conn, MAX_REQUEST, 3)
+        conn.settimeout(None)
+        request = json.loads(msg.decode("utf-8"))
+        if len(fds) != 3:
+            raise ValueError("expected three file descriptors")
+        challenge = _peer_challenge(peer_pid)
+        if request.get("challenge") != challenge:
+            raise PermissionError(f"challenge {request.get('challenge')!r} is not the client's")
+        # Only preloaded modules are served; anything else runs in the client
+        preloaded = modules.get(challenge)
+        if preloaded is None:
+            raise ValueError(f"unknown challenge {challenge!r}")
+    except (OSError, ValueError):
+        for fd in fds:
+            os.close(fd)
+        raise
+    return fds, request, preloaded
+
+
+def _serve_connection(listener: socket.socket, conn: socket.socket, modules: Preloaded) -> None:
+    """Fork a session for one client connection (runs in the parent)."""
+    try:
+        peer_pid, uid, gid = _peer_credentials(conn)
+        if os.geteuid() != 0 and uid != os.geteuid():
+            raise PermissionError("sessions for other users need a server running as root")
+    except OSError as e:
+        try:
+            conn.sendall(f"error {e}\n".encode("utf-8"))
+        except OSError:
+            pass
+        conn.close()
+        return
+    pid = os.fork()
+    if pid == 0:  # pragma: no cover - child
+        listener.close()
+        try:
+            fds, request, preloaded = _read_request(conn, modules, peer_pid)
+        except (OSError, ValueError) as e:
+            try:
+                conn.sendall(f"error {e}\n".encode("utf-8"))
+            except OSError:
+                pass
+            trace.write_trace()
+            os._exit(0)
+        code = 1
+        try:
+            code = _run_child(conn, fds, request, (uid, gid), preloaded)
+        finally:
+            try:
+                sys.stdout.flush()
+                conn.sendall(f"exit {code}\n".encode("ascii"))
+            except Exception:
+                pass
+            # os._exit skips atexit, which is where the trace is normally written
+            trace.write_trace()
+            os._exit(code)
+    conn.close()
+
+
+def _reap_children(signum: int, frame: Any) -> None:
+    while True:
+        try:
+            pid, _ = os.waitpid(-1, os.WNOHANG)
+        except ChildProcessError:
+            return
+        if pid == 0:
+            return
+
+
+def serve(socket_path: str, contents_root: Path, group: Optional[str] = None) -> None:
+    """Preload ``contents_root`` and serve sessions on ``socket_path`` until terminated.
+
+    The socket is owned by ``group`` when given (members may connect).
+    """
+    import gc
+
+    modules = preload(contents_root)
+    # Everything loaded so far lives for the server's lifetime; keeping it out
+    # of collections means children never touch (and so never copy) its pages
+    gc.collect()
+    gc.freeze()
+
+    if os.path.exists(socket_path):
+        os.unlink(socket_path)
+    server = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    server.bind(socket_path)
+    if group is not None:
+        import grp
+
+        os.chown(socket_path, -1, grp.getgrnam(group).gr_gid)
+    os.chmod(socket_path, SOCKET_MODE)
+    server.listen(64)
+    signal.signal(signal.SIGCHLD, _reap_children)
+    signal.signal(signal.SIGTERM, lambda signum, frame: sys.exit(0))
+    print(f"serving {len(modules)} modules on {socket_path}", file=sys.stderr, flush=True)
+    try:
+        while True:
+            conn, _ = server.accept()
+            _serve_connection(server, conn, modules)
+    finally:
+        server.close()
+        try:
+            os.unlink(socket_path)
+        except OSError:
+            pass
+
+
+__all__ = ["DEFAULT_SOCKET", "HOST_WIDE_PLACEHOLDERS", "preload", "serve"]
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    import argparse
+
+    parser = argparse.ArgumentParser(prog="python -m utils.server", description=__doc__.splitlines()[0])
+    parser.add_argument("--socket", default=DEFAULT_SOCKET, help="Unix socket path (default: %(default)s)")
+    parser.add_argument("--group", help="group allowed to connect (default: the server's group)")
+    parser.add_argument(
+        "--contents",
+        type=Path,
+        default=Path(__file__).resolve().parent.parent / "contents",
+        help="content root to preload (default: %(default)s)",
+    )
+    args = parser.parse_args(argv)
+    try:
+        serve(args.socket, args.contents, args.group)
+    except KeyboardInterrupt:
+        pass
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,153 @@
+"""Per-session placeholders in page sources.
+
+Page text may contain ``[flag]``, ``[user]``, ``[host]``, ``[challenge]`` and
+``[home]``. A ``Template`` finds them once, when a page is built, and keeps the
+source as literal segments split around placeholder names; rendering is then
+a join. Values are resolved lazily (only names that some page uses are ever
+looked up) and cached for the rest of the session. A placeholder whose value
+is unavailable or empty is left in the text unchanged.
+"""
+
+from __future__ import annotations
+
+import os
+import re
+import threading
+from functools import lru_cache
+from pathlib import Path
+from typing import Callable, Dict, FrozenSet, Optional, Tuple
+
+Provider = Callable[[], Optional[str]]
+
+
+def _read_flag() -> Optional[str]:
+    flag_path = Path("/flag")
+    if flag_path.exists():
+        # Read and strip; keep single-line typical flag formats intact
+        return flag_path.read_text(encoding="utf-8").strip()
+    return None
+
+
+def _read_user() -> Optional[str]:
+    import getpass
+
+    try:
+        return getpass.getuser()
+    except Exception:
+        return None
+
+
+def _read_host() -> Optional[str]:
+    import socket
+
+    return socket.gethostname()
+
+
+CHALLENGE_CONFIG = "/challenge/.config"
+
+
+def read_challenge_id(path: str = CHALLENGE_CONFIG) -> str:
+    """Read the challenge id of this host (raises ``OSError`` when it is not configured)."""
+    with open(path, "r") as file:
+        return file.read().replace("\n", "").replace("\r", "").replace(" ", "")
+
+
+def _read_challenge() -> Optional[str]:
+    try:
+        return read_challenge_id()
+    except OSError:
+        return None
+
+
+def _read_home() -> Optional[str]:
+    try:
+        return str(Path.home())
+    except RuntimeError:
+        return None
+
+
+_PROVIDERS: Dict[str, Provider] = {
+    "flag": _read_flag,
+    "user": _read_user,
+    "host": _read_host,
+    "challenge": _read_challenge,
+    "home": _read_home,
+}
+PLACEHOLDERS: FrozenSet[str] = frozenset(_PROVIDERS)
+
+_PLACEHOLDER_RE = re.compile(r"\[(" + "|".join(sorted(_PROVIDERS)) + r")\]")
+
+_VALUES: Dict[str, Optional[str]] = {}
+_VALUES_LOCK = threading.Lock()
+
+
+def session_value(name: str) -> Optional[str]:
+    """Return the value of placeholder ``name``, resolving it on first use."""
+    try:
+        return _VALUES[name]
+    except KeyError:
+        pass
+    with _VALUES_LOCK:
+        if name not in _VALUES:
+            _VALUES[name] = _PROVIDERS[name]()
+        return _VALUES[name]
+
+
+def set_session_value(name: str, value: Optional[str]) -> None:
+    """Seed the value of ``name`` (e.g. when the caller already knows it)."""
+    if name not in _PROVIDERS:
+        raise KeyError(f"unknown placeholder {name!r}")
+    with _VALUES_LOCK:
+        _VALUES[name] = value
+
+
+class Template:
+    """Page text pre-split around placeholders.
+
+    ``_parts`` alternates literal text and placeholder names (the result of
+    ``re.split`` with a capturing group), so it always has odd length and the
+    names sit at odd indices.
+    """
+
+    __slots__ = ("source", "_parts")
+
+    def __init__(self, source: str):
+        self.source = source
+        self._parts: Tuple[str, ...] = tuple(_PLACEHOLDER_RE.split(source))
+
+    @property
+    def names(self) -> FrozenSet[str]:
+        return frozenset(self._parts[1::2])
+
+    @property
+    def is_static(self) -> bool:
+        """True when the text does not depend on any session value."""
+        return len(self._parts) == 1
+
+    def render(self) -> str:
+        # Not memoized: the result would be a second copy of the text per page
+        parts = self._parts
+        if len(parts) == 1:
+            return parts[0]
+        out = list(parts)
+        for i in range(1, len(out), 2):
+            value = session_value(out[i])
+            out[i] = value if value else f"[{out[i]}]"
+        return "".join(out)
+
+
+@lru_cache(maxsize=1024)
+def compile_template(source: str) -> Template:
+    """Shared ``Template`` for ``source`` (identical texts are split only once)."""
+    return Template(source)
+
+
+__all__ = [
+    "CHALLENGE_CONFIG",
+    "PLACEHOLDERS",
+    "Template",
+    "compile_template",
+    "read_challenge_id",
+    "session_value",
+    "set_session_value",
+]
@@ -0,0 +1,142 @@
+"""Opt-in tracing of engine phases in Chrome trace-event format.
+
+Set ``SHELL_DOJO_TRACE`` to a file path before starting the engine::
+
+    SHELL_DOJO_TRACE=/tmp/dojo-trace.json python main.py
+
+Spans (module imports, page loading, markdown parsing, Rich layout, terminal
+writes, key reads) and counters (bytes and write syscalls per frame) are
+recorded in memory and written when the process exits. Open the file in
+``chrome://tracing`` or https://ui.perfetto.dev.
+
+Tracing is decided once, at import time. When it is off, ``traced`` returns
+the decorated function itself and ``span`` returns a shared no-op context
+manager, so instrumented code runs exactly as it would without it; hot paths
+guard counter updates with ``if trace.ENABLED``.
+
+A forked child (a session server child, a batch worker) starts with an empty
+trace of its own, written to ``<path>.<pid>`` so it does not overwrite its
+parent's.
+"""
+
+from __future__ import annotations
+
+import os
+import threading
+import time
+from contextlib import nullcontext
+from functools import wraps
+from typing import Any, Callable, ContextManager, Dict, List, Optional, TypeVar
+
+F = TypeVar("F", bound=Callable[..., Any])
+
+TRACE_ENV = "SHELL_DOJO_TRACE"
+TRACE_PATH: Optional[str] = os.environ.get(TRACE_ENV) or None
+ENABLED = TRACE_PATH is not None
+_BASE_PATH = TRACE_PATH
+
+_NULL_SPAN: ContextManager[None] = nullcontext()
+_EVENTS: List[Dict[str, Any]] = []
+_THREAD_NAMES: Dict[int, str] = {}
+_PID = os.getpid()
+_T0 = time.perf_counter()
+
+
+def _now_us() -> float:
+    return (time.perf_counter() - _T0) * 1e6
+
+
+class _Span:
+    def __init__(self, name: str, args: Dict[str, Any]):
+        self._name = name
+        self._args = args
+        self._start = 0.0
+
+    def __enter__(self) -> None:
+        self._start = _now_us()
+
+    def __exit__(self, *exc: Any) -> None:
+        tid = threading.get_ident()
+        if tid not in _THREAD_NAMES:
+            _THREAD_NAMES[tid] = threading.current_thread().name
+        event: Dict[str, Any] = {
+            "name": self._name,
+            "ph": "X",
+            "ts": self._start,
+            "dur": _now_us() - self._start,
+            "pid": _PID,
+            "tid": tid,
+        }
+        if self._args:
+            event["args"] = self._args
+        _EVENTS.append(event)
+
+
+def span(name: str, **args: Any) -> ContextManager[None]:
+    """Context manager recording a complete event named ``name``."""
+    if not ENABLED:
+        return _NULL_SPAN
+    return _Span(name, args)
+
+
+def traced(name: Optional[str] = None) -> Callable[[F], F]:
+    """Decorator wrapping every call of a function in a span (identity when disabled)."""
+
+    def decorate(fn: F) -> F:
+        if not ENABLED:
+            return fn
+        label = name or fn.__qualname__
+
+        @wraps(fn)
+        def wrapper(*args: Any, **kwargs: Any) -> Any:
+            with _Span(label, {}):
+                return fn(*args, **kwargs)
+
+        return wrapper  # type: ignore[return-value]
+
+    return decorate
+
+
+def counter(name: str, **values: float) -> None:
+    """Record the current value of one or more counters under ``name``."""
+    if not ENABLED:
+        return
+    _EVENTS.append({"name": name, "ph": "C", "ts": _now_us(), "pid": _PID, "args": values})
+
+
+def write_trace(path: Optional[str] = None) -> None:
+    """Write the recorded events as Chrome trace JSON to ``path`` (or ``TRACE_PATH``)."""
+    import json
+
+    target = path or TRACE_PATH
+    if not target:
+        return
+    meta = [
+        {"name": "process_name", "ph": "M", "pid": _PID, "args": {"name": "shell-dojo"}},
+    ]
+    for tid, thread_name in _THREAD_NAMES.items():
+        meta.append({"name": "thread_name", "ph": "M", "pid": _PID, "tid": tid, "args": {"name": thread_name}})
+    tmp = f"{target}.tmp"
+    with open(tmp, "w", encoding="utf-8") as f:
+        json.dump({"traceEvents": meta + list(_EVENTS), "displayTimeUnit": "ms"}, f)
+    os.replace(tmp, target)
+
+
+def _after_fork() -> None:
+    """Start a fresh trace in a forked child; the parent's events stay with the parent."""
+    global TRACE_PATH, _PID
+    _PID = os.getpid()
+    _EVENTS.clear()
+    _THREAD_NAMES.clear()
+    if _BASE_PATH is not None:
+        TRACE_PATH = f"{_BASE_PATH}.{_PID}"
+
+
+if ENABLED:
+    import atexit
+
+    atexit.register(write_trace)
+    os.register_at_fork(after_in_child=_after_fork)
+
+
+__all__ = ["ENABLED", "TRACE_ENV", "counter", "span", "traced", "write_trace"]